@@ -74,20 +74,14 @@ def calculate_node_positions(binned_data):
     for node_id_str, node_measurements in measurements.items():
         node_id = int(node_id_str)
 
-        # Transform all measurements for this node to global coordinates
-        phone_positions = []
-        for local_vector in node_measurements:
-            local_vec = np.array(local_vector)
-            # Transform local vector to global coordinates
-            global_vec = ANCHOR_R[node_id] @ local_vec
-            # Add anchor position to get absolute phone position
-            phone_pos = anchor_positions[node_id] + global_vec
-            phone_positions.append(phone_pos)
-
-        # Average the phone positions to get position estimate
-        if phone_positions:
-            avg_position = np.mean(phone_positions, axis=0)
-            node_positions[node_id] = avg_position
+        # Transform all measurements for this node to global coordinates at once:
+        # one (N, 3) array, one matmul, then add the anchor position
+        if node_measurements:
+            local_vecs = np.asarray(node_measurements, dtype=np.float64)
+            phone_positions = anchor_positions[node_id] + local_vecs @ ANCHOR_R[node_id].T
+
+            # Average the phone positions to get position estimate
+            node_positions[node_id] = phone_positions.mean(axis=0)
 
     return node_positions
 
@@ -264,30 +258,25 @@ def create_detailed_measurement_plot(binned_data, node_positions, ground_truth,
         # Plot local coordinate system measurements
         if node_id_str in measurements:
             node_measurements = measurements[node_id_str]
+            # All of this node's measurements as one (N, 3) array
+            local_vecs = np.asarray(node_measurements, dtype=np.float64).reshape(-1, 3)
 
             # Plot local coordinates (raw measurements)
-            for i, local_vector in enumerate(node_measurements):
-                local_vec = np.array(local_vector)
+            for i, local_vec in enumerate(local_vecs):
                 ax_local.scatter(local_vec[0], local_vec[1], color=node_colors[node_id],
                                alpha=0.6, s=50, label=f'Measurement {i+1}')
 
             # Calculate and plot average in local coordinates
-            if node_measurements:
-                local_avg = np.mean([np.array(v) for v in node_measurements], axis=0)
+            if len(local_vecs):
+                local_avg = local_vecs.mean(axis=0)
                 ax_local.scatter(local_avg[0], local_avg[1], color='black', marker='x', s=150,
                                label='Local Average', zorder=5)
 
             # Transform to global coordinates and plot on global plot
             # Each measurement gives us: phone_position = anchor_position + (ANCHOR_R[node_id] @ local_vector)
-            for i, local_vector in enumerate(node_measurements):
-                local_vec = np.array(local_vector)
-                # Transform local vector to global coordinates
-                global_vec = ANCHOR_R[node_id] @ local_vec
-                # Add anchor position to get absolute phone position
-                phone_position = anchor_positions[node_id] + global_vec
-
-                ax_global.scatter(phone_position[0], phone_position[1], color=node_colors[node_id],
-                                alpha=0.4, s=40, marker='o')
+            phone_positions = anchor_positions[node_id] + local_vecs @ ANCHOR_R[node_id].T
+            ax_global.scatter(phone_positions[:, 0], phone_positions[:, 1], color=node_colors[node_id],
+                            alpha=0.4, s=40, marker='o')
 
             # Plot node average in global coordinates
             if node_id in node_positions:
@@ -7,24 +7,34 @@ Measurements are colored by ground truth position (not orientation).
 All measurements are transformed to global coordinates using the same transformation as PGO.
 
 Usage:
-    uv run plot_single_anchor_measurements.py <csv_file> <anchor_id> [--raw]
+    uv run plot_single_anchor_measurements.py <csv_file> <anchor_id> [--raw] [--show]
     
 Example:
 in \Data_collection\Data:
     uv run plot_single_anchor_measurements.py datapoints28oct.csv 0
     uv run plot_single_anchor_measurements.py datapoints28oct.csv 0 --raw
+    uv run plot_single_anchor_measurements.py datapoints28oct.csv 0 --show
+
+Plots are only written to disk unless --show is given.
+Parsed measurements for all anchors are cached next to the CSV as
+<csv_stem>_<filtered|raw>_measurements.npz, so later runs (including for
+other anchors) skip the JSON parse. The cache is rebuilt when the CSV is newer.
 
 """
 
+import sys
 import pandas as pd
 import numpy as np
+import matplotlib
+# Without --show the plots are only written to disk, so use the non-GUI Agg
+# backend and skip loading a Qt/Tk toolkit
+if '--show' not in sys.argv:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
-import json
-import sys
-from typing import Dict, List, Tuple, Optional
+from typing import Dict
 from pathlib import Path
-from collections import defaultdict
+from itertools import chain
 
 # Set up plotting style
 try:
@@ -41,6 +51,11 @@ try:
 except ImportError:
     pass  # seaborn not available, use default matplotlib colors
 
+# Make `packages/` importable
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / 'packages'))
+
+from datatypes.json_codec import json_loads
+
 # Anchor positions from the codebase (in cm)
 ANCHOR_POSITIONS = {
     0: np.array([480, 600, 0]),
@@ -78,83 +93,100 @@ ANCHOR_R = {
     3: Rz(45.0) @ Ry(+45.0),   # bottom-left faces NE, tilted down
 }
 
-def transform_local_to_global(anchor_id: int, local_vector: np.ndarray) -> np.ndarray:
-    """Transform local anchor measurement to global coordinates."""
-    return ANCHOR_R[anchor_id] @ local_vector
-
-def extract_anchor_measurements(row, anchor_id: int, use_raw: bool = False) -> List[np.ndarray]:
+def build_measurement_table(df: pd.DataFrame, use_raw: bool = False) -> Dict[str, np.ndarray]:
     """
-    Extract and transform measurements from a specific anchor.
+    Flatten every anchor's local measurements into one long-format table.
     
-    Args:
-        row: DataFrame row containing measurement data
-        anchor_id: ID of the anchor to extract measurements from
-        use_raw: If True, use raw_binned_data_json; if False, use filtered_binned_data_json
-        
     Returns:
-        List of global measurement vectors (X, Y only)
+        Dict of equal-length columns: 'anchor_id', 'gt_x', 'gt_y', 'orientation'
+        and 'local' ((M, 3) float32 local measurement vectors)
     """
-    # Parse measurement data
     data_column = 'raw_binned_data_json' if use_raw else 'filtered_binned_data_json'
-    binned_data = json.loads(row[data_column])
-    measurements = binned_data['measurements']
-    
-    # Get measurements for this anchor
-    anchor_id_str = str(anchor_id)
-    if anchor_id_str not in measurements:
-        return []
-    
-    local_measurements = measurements[anchor_id_str]
-    if not local_measurements:
-        return []
-    
-    # Transform all measurements to global frame (only X,Y)
-    global_measurements = []
-    for local_vec in local_measurements:
-        local_array = np.array(local_vec)
-        global_vec = transform_local_to_global(anchor_id, local_array)
-        global_measurements.append(global_vec[:2])  # Only X,Y
-    
-    return global_measurements
+    anchor_ids = np.array(sorted(ANCHOR_POSITIONS))
+    anchor_keys = [str(anchor_id) for anchor_id in anchor_ids]
+    blobs = df[data_column].tolist()
+    
+    # Every anchor is needed here, so one full parse per row beats scanning
+    # for each anchor's sub-array; keep the vectors as plain lists and convert
+    # them to a single ndarray at the end
+    sublists = []
+    for blob in blobs:
+        measurements = json_loads(blob)['measurements']
+        sublists.extend(measurements.get(key) or [] for key in anchor_keys)
+    
+    counts = np.fromiter(map(len, sublists), dtype=np.int64, count=len(sublists))
+    row_counts = counts.reshape(len(blobs), len(anchor_ids)).sum(axis=1)
+    # Stream the coordinates straight into one preallocated buffer instead of
+    # building an intermediate list of vectors. float32 is ample for cm-scale
+    # positions and halves the bytes moved by the transform
+    coords = chain.from_iterable(chain.from_iterable(sublists))
+    local = np.fromiter(coords, dtype=np.float32, count=3 * int(counts.sum())).reshape(-1, 3)
+    
+    return {
+        'anchor_id': np.repeat(np.tile(anchor_ids, len(blobs)), counts),
+        'gt_x': np.repeat(df['ground_truth_x'].to_numpy(dtype=np.float64), row_counts),
+        'gt_y': np.repeat(df['ground_truth_y'].to_numpy(dtype=np.float64), row_counts),
+        'orientation': np.repeat(df['orientation'].to_numpy(dtype=str), row_counts),
+        'local': local
+    }
 
-def calculate_phone_positions(anchor_id: int, global_measurements: List[np.ndarray]) -> List[np.ndarray]:
-    """
-    Calculate phone positions from global measurement vectors.
+def load_measurement_table(csv_file: Path, use_raw: bool = False) -> Dict[str, np.ndarray]:
+    """Load the measurement table from its .npz sidecar, building it from the CSV if missing or stale."""
+    data_type = 'raw' if use_raw else 'filtered'
+    cache_file = csv_file.with_name(f'{csv_file.stem}_{data_type}_measurements.npz')
     
-    Args:
-        anchor_id: ID of the anchor
-        global_measurements: List of global measurement vectors (X, Y)
-        
-    Returns:
-        List of phone positions (X, Y)
-    """
-    anchor_pos = ANCHOR_POSITIONS[anchor_id][:2]  # Only X,Y
-    phone_positions = [anchor_pos + meas for meas in global_measurements]
-    return phone_positions
+    if cache_file.exists() and cache_file.stat().st_mtime >= csv_file.stat().st_mtime:
+        with np.load(cache_file) as cached:
+            table = dict(cached)
+        print(f"Loaded {len(table['local'])} cached measurements from {cache_file}")
+        return table
+    
+    # Only these columns are used; the pyarrow engine parses multi-threaded when installed
+    data_column = 'raw_binned_data_json' if use_raw else 'filtered_binned_data_json'
+    usecols = ['ground_truth_x', 'ground_truth_y', 'orientation', data_column]
+    try:
+        df = pd.read_csv(csv_file, usecols=usecols, engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv(csv_file, usecols=usecols)
+    print(f"Loaded {len(df)} data points")
+    table = build_measurement_table(df, use_raw)
+    np.savez(cache_file, **table)
+    print(f"Cached parsed measurements to {cache_file}")
+    return table
 
-def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, use_raw: bool = False):
-    """Create visualization plots for measurements from specified anchor, colored by ground truth position."""
+def create_visualizations(table: Dict[str, np.ndarray], anchor_id: int, R2: np.ndarray, anchor_xy: np.ndarray,
+                          output_dir: Path, use_raw: bool = False, show: bool = False):
+    """
+    Create visualization plots for measurements from specified anchor, colored by ground truth position.
     
-    # Group data by ground truth position (not orientation)
-    position_groups = defaultdict(list)
+    R2 is the X,Y rows of the anchor's rotation (2x3) and anchor_xy its X,Y
+    position, so phone positions are anchor_xy + local @ R2.T.
+    """
     
-    for _, row in df.iterrows():
-        gt_x = row['ground_truth_x']
-        gt_y = row['ground_truth_y']
-        orientation = row['orientation']
-        
-        # Extract measurements for the specified anchor only
-        global_measurements = extract_anchor_measurements(row, anchor_id, use_raw)
-        if global_measurements:
-            phone_positions = calculate_phone_positions(anchor_id, global_measurements)
-            
-            # Group by ground truth position (not orientation)
-            key = (int(gt_x), int(gt_y))
-            position_groups[key].append({
-                'gt_pos': np.array([gt_x, gt_y]),
-                'phone_positions': phone_positions,
-                'orientation': orientation
-            })
+    # Group data by ground truth position (not orientation); each position
+    # holds one stacked (K, 2) array of phone positions
+    position_groups = {}
+    is_anchor = table['anchor_id'] == anchor_id
+    # One batched matmul over every measurement from this anchor; the offset
+    # is added in place to avoid a second (M, 2) temporary
+    phone_positions = table['local'][is_anchor] @ R2.T
+    phone_positions += anchor_xy
+    orientations = table['orientation'][is_anchor]
+    gt_keys = pd.DataFrame({'gt_x': table['gt_x'][is_anchor].astype(int),
+                            'gt_y': table['gt_y'][is_anchor].astype(int)})
+    
+    for (gt_x, gt_y), indices in gt_keys.groupby(['gt_x', 'gt_y']).indices.items():
+        group_positions = phone_positions[indices]
+        # Accumulate statistics in float64; the bulk arrays stay float32
+        group_positions64 = group_positions.astype(np.float64)
+        mean = group_positions64.mean(axis=0)
+        std = np.sqrt(np.square(group_positions64 - mean).mean(axis=0))
+        position_groups[(int(gt_x), int(gt_y))] = {
+            'phone_positions': group_positions,
+            'orientations': orientations[indices],
+            'mean': mean,
+            'std': std
+        }
     
     if not position_groups:
         print(f"No measurements found for anchor {anchor_id}")
@@ -181,7 +213,10 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
     
     # Anchor colors by tab10 indices 
     anchor_color_indices = [4, 5, 6, 7]  # purple, brown, pink, grey
-    anchor_colors = [cmap(idx / 9.0) for idx in anchor_color_indices]
+    anchor_colors = np.array([cmap(idx / 9.0) for idx in anchor_color_indices])
+    
+    # Static anchor overlay, drawn as one scatter artist per axes
+    anchor_xy_all = np.stack([ANCHOR_POSITIONS[aid][:2] for aid in sorted(ANCHOR_POSITIONS)])
     
     # Create figure with subplots for each ground truth position
     sorted_positions = sorted(position_groups.keys())
@@ -191,27 +226,26 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
     cols = min(4, n_positions)
     rows = (n_positions + cols - 1) // cols
     
-    fig, axes = plt.subplots(rows, cols, figsize=(5*cols, 5*rows))
-    if n_positions == 1:
-        axes = [axes]
-    else:
-        axes = axes.flatten() if rows > 1 else axes
+    fig, axes = plt.subplots(rows, cols, figsize=(5*cols, 5*rows), squeeze=False)
+    axes = axes.ravel()
     
     for idx, pos_key in enumerate(sorted_positions):
         ax = axes[idx]
         gt_x, gt_y = pos_key
         group_data = position_groups[pos_key]
         
+        # Fix the view before adding artists so none of them trigger autoscaling
+        ax.set_xlim(-200, 680)
+        ax.set_ylim(-300, 900)
+        ax.set_autoscale_on(False)
+        
         # Get color for this ground truth position
         color = position_colors[pos_key]
         
         # Plot all anchor positions with distinct colors
         # Note: These are the 4 fixed anchor positions, shown as colored squares for reference
-        for aid, anchor_pos in ANCHOR_POSITIONS.items():
-            ax.scatter([anchor_pos[0]], [anchor_pos[1]], c=anchor_colors[aid], marker='s', s=45, 
-                      zorder=6, edgecolors='black', linewidths=1.2, alpha=0.8, label='Anchors' if aid == 0 else '')
-            # ax.scatter([anchor_pos[0]], [anchor_pos[1]], c='black', marker='s', s=60, 
-            #           zorder=6, edgecolors='black', linewidths=1.2, alpha=0.5, label='Anchors' if aid == 0 else '')
+        ax.scatter(anchor_xy_all[:, 0], anchor_xy_all[:, 1], c=anchor_colors, marker='s', s=45, 
+                  zorder=6, edgecolors='black', linewidths=1.2, alpha=0.8, label='Anchors')
         
         # Circle the specified anchor with a thin red circle
         specified_anchor_pos = ANCHOR_POSITIONS[anchor_id]
@@ -228,20 +262,18 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
                   zorder=5, edgecolors='black', linewidths=0.2, alpha=0.4)
         
         # Plot all phone positions from measurements for the specified anchor
-        total_measurements = 0
-        for data in group_data:
-            phone_positions = data['phone_positions']
-            if phone_positions:
-                phone_pos_array = np.array(phone_positions)
-                # Ensure color is explicitly set (should never be grey for measurements)
-                if pos_key not in position_colors:
-                    print(f"Warning: Position {pos_key} not in color map!")
-                    plot_color = 'red'  # Fallback color
-                else:
-                    plot_color = position_colors[pos_key]
-                ax.scatter(phone_pos_array[:, 0], phone_pos_array[:, 1], 
-                          c=[plot_color] * len(phone_pos_array), alpha=0.4, s=15, zorder=3)
-                total_measurements += len(phone_positions)
+        phone_pos_array = group_data['phone_positions']
+        total_measurements = len(phone_pos_array)
+        # Ensure color is explicitly set (should never be grey for measurements)
+        if pos_key not in position_colors:
+            print(f"Warning: Position {pos_key} not in color map!")
+            plot_color = 'red'  # Fallback color
+        else:
+            plot_color = position_colors[pos_key]
+        # Uniform colour/size cloud: a marker-only Line2D is cheaper than a PathCollection
+        ax.plot(phone_pos_array[:, 0], phone_pos_array[:, 1], linestyle='none', marker='o',
+                markersize=np.sqrt(15), markeredgewidth=0, color=plot_color, alpha=0.4,
+                zorder=3, rasterized=True)
         
         ax.set_xlabel('X (cm)')
         ax.set_ylabel('Y (cm)')
@@ -249,8 +281,6 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
                     f'{total_measurements} measurements')
         ax.grid(True, alpha=0.3)
         ax.set_aspect('equal', adjustable='box')
-        ax.set_xlim(-200, 680)
-        ax.set_ylim(-300, 900)
     
     # Hide unused subplots
     for idx in range(n_positions, len(axes)):
@@ -261,18 +291,20 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
     output_file = output_dir / f'anchor_{anchor_id}_measurements_by_position_{data_type}.png'
     plt.savefig(output_file, dpi=300, bbox_inches='tight')
     print(f"Saved plot to {output_file}")
-    plt.show()
+    if show:
+        plt.show()
+    plt.close(fig)
     
     # Create a combined plot showing all positions together
     fig, ax = plt.subplots(figsize=(12, 10))
+    ax.set_xlim(-200, 680)
+    ax.set_ylim(-300, 900)
+    ax.set_autoscale_on(False)
     
     # Plot all anchor positions with distinct colors
     # Note: These are the 4 fixed anchor positions, shown as colored squares for reference
-    for aid, anchor_pos in ANCHOR_POSITIONS.items():
-        ax.scatter([anchor_pos[0]], [anchor_pos[1]], c=anchor_colors[aid], marker='s', s=100, 
-                  zorder=5, edgecolors='black', linewidths=1.2, alpha=0.9)
-        # ax.scatter([anchor_pos[0]], [anchor_pos[1]], c='black', marker='s', s=60, 
-        #             zorder=6, edgecolors='black', linewidths=1.2, alpha=0.5, label='Anchors' if aid == 0 else '')
+    ax.scatter(anchor_xy_all[:, 0], anchor_xy_all[:, 1], c=anchor_colors, marker='s', s=100, 
+              zorder=5, edgecolors='black', linewidths=1.2, alpha=0.9)
 
     # Circle the specified anchor with a thin red circle
     specified_anchor_pos = ANCHOR_POSITIONS[anchor_id]
@@ -280,49 +312,42 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
                    fill=False, edgecolor='red', linewidth=1.0, zorder=8)
     ax.add_patch(circle)
     
-    # Plot all measurements grouped by ground truth position
+    # Plot all ground truth position stars as a single artist
+    gt_array = np.array(sorted_positions)
+    ax.scatter(gt_array[:, 0], gt_array[:, 1], c='black', marker='*', s=170, 
+              zorder=6, edgecolors='black', linewidths=0.2, alpha=0.4)
+    
+    # Plot all measurements grouped by ground truth position, one artist per position
     for pos_key in sorted_positions:
-        gt_x, gt_y = pos_key
         group_data = position_groups[pos_key]
         
-        color = position_colors[pos_key]
-        
-        # # Plot ground truth position as a tiny cross in the same color
-        # ax.scatter([gt_x], [gt_y], c=[color], marker='+', s=50, 
-        #           zorder=6, linewidths=2)
-        
-        # Plot ground truth position stars
-        ax.scatter([gt_x], [gt_y], c='black', marker='*', s=170, 
-                  zorder=6, edgecolors='black', linewidths=0.2, alpha=0.4)
-        
         # Plot all phone positions from the specified anchor
-        for data in group_data:
-            phone_positions = data['phone_positions']
-            if phone_positions:
-                phone_pos_array = np.array(phone_positions)
-                # Ensure color is explicitly set (should never be grey for measurements)
-                if pos_key not in position_colors:
-                    print(f"Warning: Position {pos_key} not in color map!")
-                    plot_color = 'red'  # Fallback color
-                else:
-                    plot_color = position_colors[pos_key]
-                ax.scatter(phone_pos_array[:, 0], phone_pos_array[:, 1], 
-                          c=[plot_color] * len(phone_pos_array), alpha=0.4, s=20, zorder=3)
+        phone_pos_array = group_data['phone_positions']
+        # Ensure color is explicitly set (should never be grey for measurements)
+        if pos_key not in position_colors:
+            print(f"Warning: Position {pos_key} not in color map!")
+            plot_color = 'red'  # Fallback color
+        else:
+            plot_color = position_colors[pos_key]
+        # Uniform colour/size cloud: a marker-only Line2D is cheaper than a PathCollection
+        ax.plot(phone_pos_array[:, 0], phone_pos_array[:, 1], linestyle='none', marker='o',
+                markersize=np.sqrt(20), markeredgewidth=0, color=plot_color, alpha=0.4,
+                zorder=3, rasterized=True)
     
     ax.set_xlabel('X (cm)', fontsize=12)
     ax.set_ylabel('Y (cm)', fontsize=12)
     ax.set_title(f'All Measurements from Anchor {anchor_id} at All Ground Truth Positions', fontsize=14)
     ax.grid(True, alpha=0.3)
     ax.set_aspect('equal', adjustable='box')
-    ax.set_xlim(-200, 680)
-    ax.set_ylim(-300, 900)
     
     plt.tight_layout()
     data_type = 'raw' if use_raw else 'filtered'
     output_file = output_dir / f'anchor_{anchor_id}_all_measurements_combined_{data_type}.png'
     plt.savefig(output_file, dpi=300, bbox_inches='tight')
     print(f"Saved combined plot to {output_file}")
-    plt.show()
+    if show:
+        plt.show()
+    plt.close(fig)
     
     # Create statistics table
     print("\n" + "="*80)
@@ -334,39 +359,34 @@ def create_visualizations(df: pd.DataFrame, anchor_id: int, output_dir: Path, us
     for pos_key in sorted_positions:
         gt_x, gt_y = pos_key
         group_data = position_groups[pos_key]
+        mean_x, mean_y = group_data['mean']
+        std_x, std_y = group_data['std']
         
-        all_phone_positions = []
-        for data in group_data:
-            all_phone_positions.extend(data['phone_positions'])
-        
-        if all_phone_positions:
-            phone_pos_array = np.array(all_phone_positions)
-            mean_x = np.mean(phone_pos_array[:, 0])
-            mean_y = np.mean(phone_pos_array[:, 1])
-            std_x = np.std(phone_pos_array[:, 0])
-            std_y = np.std(phone_pos_array[:, 1])
-            
-            print(f"({gt_x:6.0f}, {gt_y:6.0f})    {len(all_phone_positions):<8} "
-                  f"{mean_x:10.2f} {mean_y:10.2f} {std_x:10.2f} {std_y:10.2f}")
+        print(f"({gt_x:6.0f}, {gt_y:6.0f})    {len(group_data['phone_positions']):<8} "
+              f"{mean_x:10.2f} {mean_y:10.2f} {std_x:10.2f} {std_y:10.2f}")
     
     print("="*80)
 
 def main():
-    if len(sys.argv) < 3 or len(sys.argv) > 4:
-        print("Usage: python plot_single_anchor_measurements.py <csv_file> <anchor_id> [--raw]")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    if len(args) != 2:
+        print("Usage: python plot_single_anchor_measurements.py <csv_file> <anchor_id> [--raw] [--show]")
         print("Example: python plot_single_anchor_measurements.py datapoints28oct.csv 0")
         print("Example: python plot_single_anchor_measurements.py datapoints28oct.csv 0 --raw")
+        print("Example: python plot_single_anchor_measurements.py datapoints28oct.csv 0 --show")
         sys.exit(1)
     
-    csv_file = Path(sys.argv[1])
+    csv_file = Path(args[0])
     try:
-        anchor_id = int(sys.argv[2])
+        anchor_id = int(args[1])
     except ValueError:
-        print(f"Error: anchor_id must be an integer, got '{sys.argv[2]}'")
+        print(f"Error: anchor_id must be an integer, got '{args[1]}'")
         sys.exit(1)
     
     # Check for --raw flag
     use_raw = '--raw' in sys.argv or '-r' in sys.argv
+    # Only open interactive windows on request; batch runs just write the PNGs
+    show = '--show' in sys.argv
     
     if anchor_id not in ANCHOR_POSITIONS:
         print(f"Error: anchor_id must be one of {list(ANCHOR_POSITIONS.keys())}")
@@ -379,14 +399,18 @@ def main():
     # Create output directory
     output_dir = csv_file.parent
     
+    # Only X,Y are plotted and anchor_id is fixed for the run, so the
+    # local->global transform reduces to one constant 2x3 matrix + offset
+    R2 = np.ascontiguousarray(ANCHOR_R[anchor_id][:2, :], dtype=np.float32)
+    anchor_xy = ANCHOR_POSITIONS[anchor_id][:2].astype(np.float32)
+    
     print(f"Loading data from {csv_file}...")
-    df = pd.read_csv(csv_file)
-    print(f"Loaded {len(df)} data points")
+    table = load_measurement_table(csv_file, use_raw)
     data_type = "raw" if use_raw else "filtered"
     print(f"Analyzing {data_type} measurements from anchor {anchor_id}...")
     
     # Create visualizations filtered by anchor_id
-    create_visualizations(df, anchor_id, output_dir, use_raw)
+    create_visualizations(table, anchor_id, R2, anchor_xy, output_dir, use_raw, show)
     
     print(f"\nAnalysis complete! Results saved to {output_dir}")
 
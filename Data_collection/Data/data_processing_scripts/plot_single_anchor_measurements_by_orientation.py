@@ -7,7 +7,7 @@ All measurements are transformed to global coordinates using the same transforma
 The plot style matches anchor_{anchor_id}_all_measurements_combined.png but colors indicate orientation.
 
 Usage:
-    uv run plot_single_anchor_measurements_by_orientation.py <csv_file> <anchor_id>
+    uv run plot_single_anchor_measurements_by_orientation.py <csv_file> <anchor_id|all> [x,y,z] [--raw] [--show] [--density] [--no-style]
     
 Example:
 in \Data_collection\Data:
@@ -22,32 +22,61 @@ in \Data_collection\Data:
     or
 
     uv run data_processing_scripts\plot_single_anchor_measurements_by_orientation.py 28oct\datapoints28oct.csv all 120.0,180.0,0.0 --raw
+
+The plot is only written to disk unless --show is given. --density draws the
+measurements as an orientation-coloured density image instead of one marker per
+point (automatic above DENSITY_POINT_THRESHOLD points). --no-style keeps matplotlib's
+default style and skips importing seaborn.
+
+Local (anchor-frame) measurements for all anchors are cached next to the CSV as
+<csv_stem>_<filtered|raw>_local_measurements.npz, so later runs (other anchors
+or filters) skip the JSON parse. The cache is rebuilt when the CSV is newer; the
+transform to global X,Y is applied after every load, so it never goes stale.
 """
 
+import sys
 import pandas as pd
 import numpy as np
+import matplotlib
+# Without --show the plot is only written to disk, so use the non-GUI Agg
+# backend and skip initialising a window toolkit
+if '--show' not in sys.argv:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
-import json
-import sys
-from typing import Dict, List, Tuple, Optional
+from matplotlib.lines import Line2D
+from typing import Dict, Tuple, Optional
 from pathlib import Path
-from collections import defaultdict
 
-# Set up plotting style
-try:
-    plt.style.use('seaborn-v0_8')
-except OSError:
+def apply_plot_style():
+    """Set up the seaborn plotting style; deferred to main so --no-style skips the seaborn import."""
     try:
-        plt.style.use('seaborn')
+        plt.style.use('seaborn-v0_8')
     except OSError:
-        pass  # Use default style
+        try:
+            plt.style.use('seaborn')
+        except OSError:
+            pass  # Use default style
+    
+    try:
+        import seaborn as sns
+        sns.set_palette("husl")
+    except ImportError:
+        pass  # seaborn not available, use default matplotlib colors
+
+# Make `packages/` importable
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / 'packages'))
 
+from datatypes.json_codec import json_loads
+
+# tab10 as a (10, 4) RGBA table, evaluated once and indexed instead of calling the colormap
 try:
-    import seaborn as sns
-    sns.set_palette("husl")
-except ImportError:
-    pass  # seaborn not available, use default matplotlib colors
+    # Use the recommended approach for newer matplotlib versions
+    TAB10 = plt.colormaps['tab10'](np.arange(10) / 9.0)
+except (AttributeError, KeyError):
+    # Fallback for older matplotlib versions
+    import matplotlib.cm as cm
+    TAB10 = cm.get_cmap('tab10')(np.arange(10) / 9.0)
 
 # Anchor positions from the codebase (in cm)
 ANCHOR_POSITIONS = {
@@ -86,177 +115,240 @@ ANCHOR_R = {
     3: Rz(45.0) @ Ry(+45.0),   # bottom-left faces NE, tilted down
 }
 
-def transform_local_to_global(anchor_id: int, local_vector: np.ndarray) -> np.ndarray:
-    """Transform local anchor measurement to global coordinates."""
-    return ANCHOR_R[anchor_id] @ local_vector
+# Rotations and positions stacked into contiguous arrays indexed by anchor id, so a
+# parallel anchor id array can gather the transform for every measurement at once.
+# Only the X,Y rows of the rotation are kept: the planar part is what gets plotted
+ANCHOR_R_ALL = np.stack([ANCHOR_R[aid] for aid in sorted(ANCHOR_R)]).astype(np.float64)  # (4, 3, 3)
+R2D = np.ascontiguousarray(ANCHOR_R_ALL[:, :2, :])  # (4, 2, 3)
+ANCHOR_XY = np.stack([ANCHOR_POSITIONS[aid][:2] for aid in sorted(ANCHOR_POSITIONS)]).astype(np.float64)  # (4, 2)
 
-def extract_anchor_measurements(row, anchor_id: int, use_raw: bool = False) -> List[np.ndarray]:
+def local_measurements_array(local_measurements: list) -> np.ndarray:
     """
-    Extract and transform measurements from a specific anchor.
+    Convert a list of [x, y, z] local vectors to an (N, 3) float64 array in one call.
     
-    Args:
-        row: DataFrame row containing measurement data
-        anchor_id: ID of the anchor to extract measurements from
-        use_raw: If True, use raw_binned_data_json; if False, use filtered_binned_data_json
-        
-    Returns:
-        List of global measurement vectors (X, Y only)
+    Raises:
+        ValueError: If the measurements are not a list of 3-element vectors
     """
-    # Parse measurement data
-    data_column = 'raw_binned_data_json' if use_raw else 'filtered_binned_data_json'
-    binned_data = json.loads(row[data_column])
-    measurements = binned_data['measurements']
-    
-    # Get measurements for this anchor
-    anchor_id_str = str(anchor_id)
-    if anchor_id_str not in measurements:
-        return []
-    
-    local_measurements = measurements[anchor_id_str]
-    if not local_measurements:
-        return []
-    
-    # Transform all measurements to global frame (only X,Y)
-    global_measurements = []
-    for local_vec in local_measurements:
-        local_array = np.array(local_vec)
-        global_vec = transform_local_to_global(anchor_id, local_array)
-        global_measurements.append(global_vec[:2])  # Only X,Y
-    
-    return global_measurements
+    local_array = np.asarray(local_measurements, dtype=np.float64)
+    if local_array.ndim != 2 or local_array.shape[1] != 3:
+        raise ValueError(f"Anchor measurements must be [x, y, z] vectors, got shape {local_array.shape}")
+    return local_array
 
-def extract_all_anchor_measurements(row, use_raw: bool = False) -> List[Tuple[int, np.ndarray]]:
+# CSV rows parsed per chunk when building the measurement table
+CSV_CHUNK_ROWS = 100_000
+
+# Columns of the per-measurement table built from the CSV and cached: local vectors only,
+# so the cache never depends on the anchor transform constants above
+LOCAL_COLUMNS = ['ground_truth_x', 'ground_truth_y', 'ground_truth_z', 'orientation', 'anchor_id',
+                 'local_x', 'local_y', 'local_z']
+# Columns of the table handed to plotting, with global X,Y
+TABLE_COLUMNS = ['ground_truth_x', 'ground_truth_y', 'ground_truth_z', 'orientation', 'anchor_id', 'x', 'y']
+
+def build_measurement_table(df: pd.DataFrame, use_raw: bool = False) -> pd.DataFrame:
     """
-    Extract and transform measurements from all anchors.
+    Explode every CSV row into one record per measurement (all anchors) in local coordinates.
     
     Args:
-        row: DataFrame row containing measurement data
+        df: DataFrame with ground truth, orientation and binned data JSON columns
         use_raw: If True, use raw_binned_data_json; if False, use filtered_binned_data_json
         
     Returns:
-        List of tuples (anchor_id, global_measurement_vector) for all anchors
+        DataFrame with LOCAL_COLUMNS; local_x/y/z are float64 anchor-frame vectors
     """
-    # Parse measurement data
     data_column = 'raw_binned_data_json' if use_raw else 'filtered_binned_data_json'
-    binned_data = json.loads(row[data_column])
-    measurements = binned_data['measurements']
-    
-    all_measurements = []
-    for anchor_id in ANCHOR_POSITIONS.keys():
-        anchor_id_str = str(anchor_id)
-        if anchor_id_str in measurements:
-            local_measurements = measurements[anchor_id_str]
+    # A plain loop over the extracted strings avoids Series.map's per-element overhead
+    parsed_rows = [json_loads(blob) for blob in df[data_column].tolist()]
+    
+    # Flatten the local vectors of every anchor in the chunk (in CSV row order) with a
+    # parallel anchor id array, so to_global_table can transform them in one gathered pass
+    local_vectors, anchor_ids, row_counts = [], [], []
+    for binned_data in parsed_rows:
+        measurements = binned_data['measurements']
+        row_count = 0
+        for aid in ANCHOR_POSITIONS:
+            local_measurements = measurements.get(str(aid))
             if local_measurements:
-                for local_vec in local_measurements:
-                    local_array = np.array(local_vec)
-                    global_vec = transform_local_to_global(anchor_id, local_array)
-                    all_measurements.append((anchor_id, global_vec[:2]))  # Only X,Y
+                local_vectors.extend(local_measurements)
+                anchor_ids.extend([aid] * len(local_measurements))
+                row_count += len(local_measurements)
+        row_counts.append(row_count)
     
-    return all_measurements
+    if local_vectors:
+        local_array = local_measurements_array(local_vectors)
+    else:
+        local_array = np.empty((0, 3))
+    return pd.DataFrame({
+        'ground_truth_x': np.repeat(df['ground_truth_x'].to_numpy(dtype=np.float64), row_counts),
+        'ground_truth_y': np.repeat(df['ground_truth_y'].to_numpy(dtype=np.float64), row_counts),
+        'ground_truth_z': np.repeat(df['ground_truth_z'].to_numpy(dtype=np.float64), row_counts),
+        'orientation': np.repeat(df['orientation'].to_numpy(dtype=str), row_counts),
+        'anchor_id': np.asarray(anchor_ids, dtype=np.int8),
+        'local_x': local_array[:, 0],
+        'local_y': local_array[:, 1],
+        'local_z': local_array[:, 2]
+    })
 
-def calculate_phone_positions(anchor_id: int, global_measurements: List[np.ndarray]) -> List[np.ndarray]:
+def to_global_table(local_table: pd.DataFrame) -> pd.DataFrame:
     """
-    Calculate phone positions from global measurement vectors.
+    Transform a LOCAL_COLUMNS table to TABLE_COLUMNS (global X,Y phone positions, float32).
     
-    Args:
-        anchor_id: ID of the anchor
-        global_measurements: List of global measurement vectors (X, Y)
-        
-    Returns:
-        List of phone positions (X, Y)
+    Done after every load, cached or not, so edits to ANCHOR_R / ANCHOR_POSITIONS always apply.
+    """
+    anchor_ids = local_table['anchor_id'].to_numpy(dtype=np.intp)
+    local_array = local_table[['local_x', 'local_y', 'local_z']].to_numpy(dtype=np.float64)
+    # Rotate, then add the gathered (N, 2) anchor offsets in place (no extra temporary)
+    phone_xy = np.einsum('nij,nj->ni', R2D[anchor_ids], local_array)
+    phone_xy += ANCHOR_XY[anchor_ids]
+    phone_xy = phone_xy.astype(np.float32)
+    return pd.DataFrame({
+        'ground_truth_x': local_table['ground_truth_x'].to_numpy(),
+        'ground_truth_y': local_table['ground_truth_y'].to_numpy(),
+        'ground_truth_z': local_table['ground_truth_z'].to_numpy(),
+        'orientation': local_table['orientation'].to_numpy(),
+        'anchor_id': anchor_ids.astype(np.int8),
+        'x': phone_xy[:, 0],
+        'y': phone_xy[:, 1]
+    })
+
+def load_measurement_table(csv_file: Path, use_raw: bool = False) -> pd.DataFrame:
+    """
+    Load the measurement table in global X,Y. The local measurements are cached in a .npz
+    sidecar (rebuilt from the CSV if missing or stale); the transform is applied on every load.
     """
-    anchor_pos = ANCHOR_POSITIONS[anchor_id][:2]  # Only X,Y
-    phone_positions = [anchor_pos + meas for meas in global_measurements]
-    return phone_positions
+    data_type = 'raw' if use_raw else 'filtered'
+    cache_file = csv_file.with_name(f'{csv_file.stem}_{data_type}_local_measurements.npz')
+    
+    if cache_file.exists() and cache_file.stat().st_mtime >= csv_file.stat().st_mtime:
+        with np.load(cache_file) as cached:
+            table = pd.DataFrame({column: cached[column] for column in LOCAL_COLUMNS})
+        print(f"Loaded {len(table)} cached measurements from {cache_file}")
+        return to_global_table(table)
+    
+    # Only the ground truth, orientation and selected JSON column are used. The CSV is
+    # streamed in chunks so only the compact per-measurement table for the whole file
+    # is held in memory, never the raw JSON strings
+    data_column = 'raw_binned_data_json' if use_raw else 'filtered_binned_data_json'
+    usecols = ['ground_truth_x', 'ground_truth_y', 'ground_truth_z', 'orientation', data_column]
+    chunk_tables, row_count = [], 0
+    for chunk in pd.read_csv(csv_file, usecols=usecols, chunksize=CSV_CHUNK_ROWS):
+        chunk_tables.append(build_measurement_table(chunk, use_raw))
+        row_count += len(chunk)
+    print(f"Loaded {row_count} data points")
+    
+    if chunk_tables:
+        table = pd.concat(chunk_tables, ignore_index=True)
+    else:
+        table = pd.DataFrame({column: [] for column in LOCAL_COLUMNS})
+    # Orientation is stored as a fixed-width string array so the cache loads without pickle
+    arrays = {column: table[column].to_numpy() for column in LOCAL_COLUMNS}
+    arrays['orientation'] = arrays['orientation'].astype(str)
+    np.savez(cache_file, **arrays)
+    print(f"Cached local measurements to {cache_file}")
+    return to_global_table(table)
+
+# Above this many points the measurement cloud is drawn as a density image
+# instead of one marker per point; with --density, from DENSITY_MIN_POINTS on
+DENSITY_POINT_THRESHOLD = 200_000
+DENSITY_MIN_POINTS = 5_000
+
+# Fixed X window of the plot (cm); the density image is only binned over this range
+PLOT_XLIM = (-100, 600)
+# Upper bound on density bins per axis, so a far outlier coarsens the bins instead of
+# growing the histogram without limit
+DENSITY_MAX_BINS = 1000
+
+def density_bin_edges(lo: float, hi: float, bin_size: float) -> np.ndarray:
+    """Bin edges covering [lo, hi] at bin_size, widened so there are at most DENSITY_MAX_BINS bins."""
+    bin_size = max(bin_size, (hi - lo) / DENSITY_MAX_BINS)
+    n_bins = min(max(int(np.ceil((hi - lo) / bin_size)), 1), DENSITY_MAX_BINS)
+    return lo + bin_size * np.arange(n_bins + 1)
+
+def plot_orientation_density(ax, orientation_xy: Dict[str, np.ndarray], orientation_colors: Dict[str, tuple],
+                             bin_size: float = 2.0):
+    """
+    Draw measurements as an image, each bin coloured by its most frequent orientation.
+    
+    Opacity scales with log point count, so dense regions stay readable at any N.
+    X is binned over the fixed PLOT_XLIM window (points outside it are never shown);
+    Y follows the data, with the bin count capped at DENSITY_MAX_BINS.
+    """
+    orientations = sorted(orientation_xy.keys())
+    all_y = np.concatenate([orientation_xy[orient][:, 1] for orient in orientations])
+    x_edges = density_bin_edges(PLOT_XLIM[0], PLOT_XLIM[1], bin_size)
+    y_edges = density_bin_edges(float(all_y.min()), float(all_y.max()), bin_size)
+    
+    # (n_orientations, nx, ny) per-orientation counts
+    counts = np.stack([np.histogram2d(orientation_xy[orient][:, 0], orientation_xy[orient][:, 1],
+                                      bins=(x_edges, y_edges))[0]
+                       for orient in orientations])
+    total = counts.sum(axis=0)
+    
+    palette = np.array([orientation_colors[orient] for orient in orientations])
+    rgba = palette[counts.argmax(axis=0)]
+    rgba[..., 3] = np.log1p(total) / np.log1p(max(total.max(), 1.0))
+    
+    ax.imshow(rgba.transpose(1, 0, 2), origin='lower', interpolation='nearest', aspect='auto',
+              extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]), zorder=3)
 
-def create_visualizations_by_orientation(df: pd.DataFrame, anchor_id: Optional[int], output_dir: Path, coord_filter: Optional[Tuple[float, float, float]] = None, use_raw: bool = False):
+def create_visualizations_by_orientation(table: pd.DataFrame, anchor_id: Optional[int], output_dir: Path, coord_filter: Optional[Tuple[float, float, float]] = None, use_raw: bool = False,
+                                         show: bool = False, density: bool = False):
     """
     Create visualization plots for measurements, colored by phone orientation.
     
     Args:
-        df: DataFrame with measurement data (already filtered if coord_filter was provided)
+        table: Per-measurement table from load_measurement_table (already filtered if coord_filter was provided)
         anchor_id: ID of anchor to plot, or None for all anchors combined
         output_dir: Directory to save output files
         coord_filter: Optional tuple (x, y, z) indicating filtered coordinates
         use_raw: If True, use raw_binned_data_json; if False, use filtered_binned_data_json
+        show: If True, also display the plot interactively
+        density: If True, draw a density image instead of a scatter (unless there are
+            fewer than DENSITY_MIN_POINTS measurements)
     """
     
-    # Group data by orientation
-    orientation_groups = defaultdict(list)
+    # Collect all unique ground truth positions for plotting stars (float32 is plenty
+    # for rendering and keeps the arrays handed to matplotlib half the size)
+    gt_unique = table[['ground_truth_x', 'ground_truth_y']].drop_duplicates().to_numpy(dtype=np.float32)
     
-    # Collect all unique ground truth positions for plotting crosses
-    all_gt_positions = set()
+    if anchor_id is not None:
+        table = table[table['anchor_id'].to_numpy() == anchor_id]
     
-    for _, row in df.iterrows():
-        gt_x = row['ground_truth_x']
-        gt_y = row['ground_truth_y']
-        orientation = row['orientation']
-        all_gt_positions.add((gt_x, gt_y))
-        
-        if anchor_id is None:
-            # Extract measurements from all anchors
-            all_measurements = extract_all_anchor_measurements(row, use_raw)
-            if all_measurements:
-                phone_positions = []
-                for aid, global_meas in all_measurements:
-                    anchor_pos = ANCHOR_POSITIONS[aid][:2]
-                    phone_pos = anchor_pos + global_meas
-                    phone_positions.append(phone_pos)
-                
-                if phone_positions:
-                    orientation_groups[orientation].append({
-                        'gt_pos': np.array([gt_x, gt_y]),
-                        'phone_positions': phone_positions,
-                        'orientation': orientation
-                    })
-        else:
-            # Extract measurements for the specified anchor only
-            global_measurements = extract_anchor_measurements(row, anchor_id, use_raw)
-            if global_measurements:
-                phone_positions = calculate_phone_positions(anchor_id, global_measurements)
-                
-                orientation_groups[orientation].append({
-                    'gt_pos': np.array([gt_x, gt_y]),
-                    'phone_positions': phone_positions,
-                    'orientation': orientation
-                })
-    
-    if not orientation_groups:
+    if len(table) == 0:
         anchor_str = "all anchors" if anchor_id is None else f"anchor {anchor_id}"
         print(f"No measurements found for {anchor_str}")
         return
     
-    # Create color map for orientations
-    unique_orientations = sorted(orientation_groups.keys())
+    # Sort measurements by orientation once into a single (N, 2) array with a parallel
+    # orientation index (orientations in order, so later ones still draw on top)
+    orient_codes, orientation_labels = pd.factorize(table['orientation'], sort=True)
+    unique_orientations = list(orientation_labels)
     print(f"Found {len(unique_orientations)} unique orientations: {unique_orientations}")
     
-    # Use tab10 colormap to assign colors to orientations
-    try:
-        # Use the recommended approach for newer matplotlib versions
-        cmap = plt.colormaps['tab10']
-    except (AttributeError, KeyError):
-        # Fallback for older matplotlib versions
-        import matplotlib.cm as cm
-        cmap = cm.get_cmap('tab10')
-    
-    orientation_colors = {}
-    for idx, orient in enumerate(unique_orientations):
-        # Normalize index to 0-1 range for colormap (using modulo to cycle through colors)
-        orientation_colors[orient] = cmap((idx % 10) / 9.0)
+    order = np.argsort(orient_codes, kind='stable')
+    all_xy = table[['x', 'y']].to_numpy(dtype=np.float32)[order]
+    orient_idx = orient_codes[order]
+    orientation_counts = np.bincount(orient_idx, minlength=len(unique_orientations))
+    
+    # Per-orientation (N_i, 2) views into all_xy, no extra copies
+    orientation_xy = dict(zip(unique_orientations, np.split(all_xy, np.cumsum(orientation_counts)[:-1])))
+    
+    # Assign tab10 colors to orientations (using modulo to cycle through colors)
+    orientation_palette = TAB10[np.arange(len(unique_orientations)) % 10]
+    orientation_colors = dict(zip(unique_orientations, orientation_palette))
     
     # Anchor colors by tab10 indices
     anchor_color_indices = [4, 5, 6, 7]  # purple, brown, pink, grey
-    anchor_colors = [cmap(idx / 9.0) for idx in anchor_color_indices]
+    anchor_colors = TAB10[anchor_color_indices]
     
     # Create a combined plot showing all orientations together (same style as position-based plot)
-    fig, ax = plt.subplots(figsize=(12, 10))
+    # Constrained layout is solved at draw time, replacing a separate tight_layout pass
+    fig, ax = plt.subplots(figsize=(12, 10), layout='constrained')
     
     # Plot all anchor positions with distinct colors
     # Note: These are the 4 fixed anchor positions, shown as colored squares for reference
     # They are NOT measurement dots - they are the fixed anchor locations
-    for aid, anchor_pos in ANCHOR_POSITIONS.items():
-        ax.scatter([anchor_pos[0]], [anchor_pos[1]], c=anchor_colors[aid], marker='s', s=100, 
-                  zorder=5, edgecolors='black', linewidths=1.2, alpha=0.9)
+    ax.scatter(ANCHOR_XY[:, 0], ANCHOR_XY[:, 1], c=anchor_colors, marker='s', s=100, 
+              zorder=5, edgecolors='black', linewidths=1.2, alpha=0.9)
     
     # Circle the specified anchor with a thin red circle (if anchor_id is specified)
     if anchor_id is not None:
@@ -266,26 +358,29 @@ def create_visualizations_by_orientation(df: pd.DataFrame, anchor_id: Optional[i
         ax.add_patch(circle)
     
     # Plot all ground truth positions as black stars (once, not per orientation)
-    for gt_x, gt_y in all_gt_positions:
-        ax.scatter([gt_x], [gt_y], c='black', marker='*', s=170, 
-                  zorder=6, edgecolors='black', linewidths=0.2, alpha=0.4)
-    
-    # Plot all measurements grouped by orientation
-    for orient in unique_orientations:
-        group_data = orientation_groups[orient]
-        color = orientation_colors[orient]
-        
-        # Collect all phone positions for this orientation
-        all_phone_positions_for_orient = []
-        for data in group_data:
-            all_phone_positions_for_orient.extend(data['phone_positions'])
-        
-        # Plot all phone positions for this orientation
-        if all_phone_positions_for_orient:
-            phone_pos_array = np.array(all_phone_positions_for_orient)
-            ax.scatter(phone_pos_array[:, 0], phone_pos_array[:, 1], 
-                      c=[color] * len(phone_pos_array), alpha=0.4, s=20, 
-                      zorder=3, label=f'Orientation {orient}')
+    ax.scatter(gt_unique[:, 0], gt_unique[:, 1], c='black', marker='*', s=170, 
+              zorder=6, edgecolors='black', linewidths=0.2, alpha=0.4)
+    
+    if len(all_xy) > DENSITY_POINT_THRESHOLD or (density and len(all_xy) >= DENSITY_MIN_POINTS):
+        print(f"Drawing {len(all_xy)} measurements as a density image")
+        plot_orientation_density(ax, orientation_xy, orientation_colors)
+    else:
+        # Each orientation is a single colour, so plot it as a marker-only line: Agg
+        # stamps one cached marker per point instead of going through a PathCollection.
+        # Orientations are drawn in sorted order, so later ones still sit on top.
+        # Rasterized so vector outputs embed the cloud as one image; markers stay vector
+        for orient in unique_orientations:
+            orient_xy = orientation_xy[orient]
+            ax.plot(orient_xy[:, 0], orient_xy[:, 1], linestyle='None', marker='o',
+                    markersize=np.sqrt(20), markerfacecolor=orientation_colors[orient],
+                    markeredgecolor='none', alpha=0.4, zorder=3, rasterized=True)
+    
+    # Proxy handles stand in for the per-orientation artists in the legend (the density
+    # image has none of its own)
+    legend_handles = [Line2D([0], [0], marker='o', linestyle='', markersize=np.sqrt(20),
+                             markeredgewidth=0, color=orientation_colors[orient],
+                             alpha=0.4, label=f'Orientation {orient}')
+                      for orient in unique_orientations]
     
     ax.set_xlabel('X (cm)', fontsize=12)
     ax.set_ylabel('Y (cm)', fontsize=12)
@@ -303,12 +398,10 @@ def create_visualizations_by_orientation(df: pd.DataFrame, anchor_id: Optional[i
     ax.set_title(title, fontsize=14)
     ax.grid(True, alpha=0.3)
     ax.set_aspect('equal', adjustable='box')
-    ax.set_xlim(-100, 600)
+    ax.set_xlim(*PLOT_XLIM)
     
     # Add legend
-    ax.legend(loc='best', fontsize=10)
-    
-    plt.tight_layout()
+    ax.legend(handles=legend_handles, loc='best', fontsize=10)
     
     # Build output filename
     if anchor_id is None:
@@ -323,9 +416,12 @@ def create_visualizations_by_orientation(df: pd.DataFrame, anchor_id: Optional[i
         base_name += coord_str
     
     output_file = output_dir / f'{base_name}.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    # Software=None leaves out the matplotlib version stamp
+    fig.savefig(output_file, dpi=300, bbox_inches='tight', metadata={'Software': None})
     print(f"Saved orientation-based plot to {output_file}")
-    plt.show()
+    if show:
+        plt.show()
+    plt.close(fig)
     
     # Create statistics table by orientation
     print("\n" + "="*80)
@@ -337,33 +433,28 @@ def create_visualizations_by_orientation(df: pd.DataFrame, anchor_id: Optional[i
     print(f"{'Orientation':<15} {'Count':<8} {'Mean X':<10} {'Mean Y':<10} {'Std X':<10} {'Std Y':<10}")
     print("-"*80)
     
-    for orient in unique_orientations:
-        group_data = orientation_groups[orient]
-        
-        all_phone_positions = []
-        for data in group_data:
-            all_phone_positions.extend(data['phone_positions'])
-        
-        if all_phone_positions:
-            phone_pos_array = np.array(all_phone_positions)
-            mean_x = np.mean(phone_pos_array[:, 0])
-            mean_y = np.mean(phone_pos_array[:, 1])
-            std_x = np.std(phone_pos_array[:, 0])
-            std_y = np.std(phone_pos_array[:, 1])
-            
-            print(f"{orient:<15} {len(all_phone_positions):<8} "
-                  f"{mean_x:10.2f} {mean_y:10.2f} {std_x:10.2f} {std_y:10.2f}")
+    # Means and population stds (ddof=0, as np.std) for all orientations in one grouped
+    # pandas pass over the sorted point array (in float64, the plotting copy is float32)
+    grouped = pd.DataFrame(all_xy, columns=['x', 'y'], dtype=np.float64).groupby(orient_idx, sort=True)
+    means = grouped.mean().to_numpy()
+    stds = grouped.std(ddof=0).to_numpy()
+    
+    for orient, count, (mean_x, mean_y), (std_x, std_y) in zip(unique_orientations, orientation_counts, means, stds):
+        print(f"{orient:<15} {count:<8} "
+              f"{mean_x:10.2f} {mean_y:10.2f} {std_x:10.2f} {std_y:10.2f}")
     
     print("="*80)
 
 def main():
-    if len(sys.argv) < 3 or len(sys.argv) > 5:
-        print("Usage: uv run plot_single_anchor_measurements_by_orientation.py <csv_file> <anchor_id|all> [x,y,z] [--raw]")
+    if len(sys.argv) < 3 or len(sys.argv) > 8:
+        print("Usage: uv run plot_single_anchor_measurements_by_orientation.py <csv_file> <anchor_id|all> [x,y,z] [--raw] [--show] [--density] [--no-style]")
         print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv 0")
         print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv all")
         print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv 3 0,0,0")
         print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv all 120.0,180.0,0.0")
         print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv 0 --raw")
+        print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv all --show")
+        print("Example: uv run plot_single_anchor_measurements_by_orientation.py datapoints28oct.csv all --density")
         sys.exit(1)
     
     csv_file = Path(sys.argv[1])
@@ -371,11 +462,15 @@ def main():
     
     # Check for --raw flag
     use_raw = '--raw' in sys.argv or '-r' in sys.argv
+    show = '--show' in sys.argv
+    density = '--density' in sys.argv
+    if '--no-style' not in sys.argv:
+        apply_plot_style()
     
     # Parse optional coordinate filter
     coord_filter: Optional[Tuple[float, float, float]] = None
     for arg in sys.argv[3:]:
-        if arg not in ['--raw', '-r']:
+        if arg not in ['--raw', '-r', '--show', '--density', '--no-style']:
             coord_str = arg
             try:
                 coords = [float(x.strip()) for x in coord_str.split(',')]
@@ -411,28 +506,27 @@ def main():
     output_dir = csv_file.parent
     
     print(f"Loading data from {csv_file}...")
-    df = pd.read_csv(csv_file)
-    print(f"Loaded {len(df)} data points")
+    try:
+        df = load_measurement_table(csv_file, use_raw)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     
     # Apply coordinate filter if provided
     if coord_filter is not None:
         filter_x, filter_y, filter_z = coord_filter
         original_count = len(df)
-        df_filtered = df[
-            (df['ground_truth_x'] == filter_x) &
-            (df['ground_truth_y'] == filter_y) &
-            (df['ground_truth_z'] == filter_z)
-        ]
-        # Ensure it's a DataFrame (not a Series)
-        if isinstance(df_filtered, pd.Series):
-            df_filtered = df_filtered.to_frame().T
-        df_filtered = df_filtered.copy()
-        filtered_count = len(df_filtered)
-        print(f"Filtered to coordinates ({filter_x}, {filter_y}, {filter_z}): {filtered_count} rows (from {original_count})")
+        # Compare on the raw NumPy arrays (no index alignment); boolean indexing
+        # already returns a new frame, so no extra copy is needed
+        mask = ((df['ground_truth_x'].to_numpy() == filter_x) &
+                (df['ground_truth_y'].to_numpy() == filter_y) &
+                (df['ground_truth_z'].to_numpy() == filter_z))
+        df = df[mask]
+        filtered_count = len(df)
+        print(f"Filtered to coordinates ({filter_x}, {filter_y}, {filter_z}): {filtered_count} measurements (from {original_count})")
         if filtered_count == 0:
             print(f"Warning: No data points found for coordinates ({filter_x}, {filter_y}, {filter_z})")
             sys.exit(1)
-        df = df_filtered
     
     data_type = "raw" if use_raw else "filtered"
     if anchor_id is None:
@@ -441,7 +535,7 @@ def main():
         print(f"Analyzing {data_type} measurements from anchor {anchor_id} by orientation...")
     
     # Create visualizations colored by orientation
-    create_visualizations_by_orientation(df, anchor_id, output_dir, coord_filter, use_raw)
+    create_visualizations_by_orientation(df, anchor_id, output_dir, coord_filter, use_raw, show, density)
     
     print(f"\nAnalysis complete! Results saved to {output_dir}")
 
@@ -1,10 +1,12 @@
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
 
 import matplotlib
 matplotlib.use('Agg')  # non-interactive backend for saving figures
 import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
 import numpy as np
 import pandas as pd
 
@@ -15,12 +17,17 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent / 'packages'))
 from datatypes.datatypes import AnchorConfig  # type: ignore[reportMissingImports]
 from localization_algos.pgo import PGOSolver  # type: ignore[reportMissingImports]
 from localization_algos.edge_creation.anchor_edges import create_anchor_anchor_edges  # type: ignore[reportMissingImports]
-from localization_algos.edge_creation.transforms import create_relative_measurement  # type: ignore[reportMissingImports]
+from localization_algos.edge_creation.transforms import ANCHOR_R  # type: ignore[reportMissingImports]
+from datatypes.json_codec import json_loads  # type: ignore[reportMissingImports]
 
 # to run:
 #   uv run Data_collection/Data/data_processing_scripts/run_pgo_on_binned_data.py Data_collection/Data/28oct/datapoints28oct.csv --positions A,B,C --anchors 0,1,2,3
 # vary orientations and anchors accordingly in cmd args
 
+# Transposed anchor rotations stacked into one contiguous (4, 3, 3) array, built once
+# at import so each batch is a plain `local @ ANCHOR_R_T[aid]` with no per-call transpose
+ANCHOR_R_T = np.ascontiguousarray(np.stack([ANCHOR_R[aid].T for aid in sorted(ANCHOR_R)]), dtype=np.float64)
+
 
 def get_default_anchor_config() -> AnchorConfig:
     """Ground-truth anchor positions (cm) in room frame.
@@ -35,6 +42,13 @@ def get_default_anchor_config() -> AnchorConfig:
     return AnchorConfig(positions=positions)
 
 
+# The anchor layout is fixed, so its positions and the anchor-anchor edges are the
+# same for every row; build them once at import instead of once per solved row
+_ANCHOR_CFG = get_default_anchor_config()
+_ANCHOR_POSITIONS: Dict[int, np.ndarray] = _ANCHOR_CFG.get_all_positions()
+_ANCHOR_ANCHOR_EDGES: List[Tuple[str, str, np.ndarray]] = create_anchor_anchor_edges(_ANCHOR_CFG)
+
+
 def build_graph_from_binned(
     binned: Dict,
     allowed_anchor_ids: Optional[Set[int]] = None,
@@ -47,8 +61,8 @@ def build_graph_from_binned(
     edges: list of (from_node, to_node, relative_vector) in global frame
     anchor_positions: dict anchor_id -> position for anchoring
     """
-    anchor_cfg = get_default_anchor_config()
-    anchor_positions = anchor_cfg.get_all_positions()
+    # Fresh dict per row (the arrays themselves are shared and never modified)
+    anchor_positions = dict(_ANCHOR_POSITIONS)
 
     phone_node_id: int = int(binned["phone_node_id"])  # e.g. 0
 
@@ -56,37 +70,34 @@ def build_graph_from_binned(
     nodes: Dict[str, Optional[np.ndarray]] = {f"anchor_{aid}": pos for aid, pos in anchor_positions.items()}
     nodes[f"phone_{phone_node_id}"] = None  # unknown initial
 
-    edges: List[Tuple[str, str, np.ndarray]] = []
-
-    # Add anchor-anchor edges to rigidify the graph
-    edges.extend(create_anchor_anchor_edges(anchor_cfg))
+    # Start from the cached anchor-anchor edges to rigidify the graph
+    edges: List[Tuple[str, str, np.ndarray]] = list(_ANCHOR_ANCHOR_EDGES)
 
     # Add anchor->phone relative measurement edges (optionally filtered by anchors)
     # binned['measurements'] is a mapping of anchor_id (as string) -> list of local vectors
+    # Each anchor's vectors are rotated to the global frame in one (N, 3) @ R.T matmul
+    # (same transform as create_relative_measurement, without a tiny matmul per vector)
     meas: Dict[str, List[List[float]]] = binned.get("measurements", {})
+    phone_node = f"phone_{phone_node_id}"
     for anchor_id_str, vectors in meas.items():
         anchor_id = int(anchor_id_str)
         if allowed_anchor_ids is not None and anchor_id not in allowed_anchor_ids:
             continue
-        for vec in vectors:
-            local_vec = np.array(vec, dtype=float)
-            edge = create_relative_measurement(anchor_id, phone_node_id, local_vec)
-            edges.append(edge)
+        if anchor_id not in ANCHOR_R:
+            raise ValueError(f"Invalid anchor_id: {anchor_id}. Must be 0-3.")
+        if not vectors:
+            continue
+        local_vecs = np.asarray(vectors, dtype=float)
+        if local_vecs.ndim != 2 or local_vecs.shape[1] != 3:
+            raise ValueError(f"Anchor {anchor_id} vectors must be shape (N, 3), got {local_vecs.shape}")
+        anchor_node = f"anchor_{anchor_id}"
+        edges.extend((anchor_node, phone_node, v_global) for v_global in local_vecs @ ANCHOR_R_T[anchor_id])
 
     return nodes, edges, anchor_positions
 
 
-def run_single_row_series(row: pd.Series, allowed_anchor_ids: Optional[Set[int]] = None) -> Dict:
-    # Ground truth (if present)
-    gt = np.array([
-        row.get('ground_truth_x', np.nan),
-        row.get('ground_truth_y', np.nan),
-        row.get('ground_truth_z', np.nan)
-    ], dtype=float)
-
-    # Parse filtered binned json
-    binned = json.loads(str(row['filtered_binned_data_json']))
-
+def run_single_row_series(binned: Dict, gt: np.ndarray, allowed_anchor_ids: Optional[Set[int]] = None) -> Dict:
+    """Solve PGO for one already-parsed binned-data dict; gt is (x, y, z), NaN where unknown."""
     nodes, edges, anchor_positions = build_graph_from_binned(binned, allowed_anchor_ids=allowed_anchor_ids)
 
     solver = PGOSolver()
@@ -107,12 +118,23 @@ def run_single_row_series(row: pd.Series, allowed_anchor_ids: Optional[Set[int]]
     return out
 
 
+def solve_row(task: Tuple[str, np.ndarray, Optional[Set[int]]]) -> Dict:
+    """Parse and solve one row from (binned JSON string, ground truth, allowed anchors).
+
+    Module-level so ProcessPoolExecutor workers can unpickle it; only the JSON
+    string and small arrays cross the process boundary.
+    """
+    binned_json, gt, allowed_anchor_ids = task
+    return run_single_row_series(json_loads(binned_json), gt, allowed_anchor_ids=allowed_anchor_ids)
+
+
 def plot_result(anchors: Dict[int, np.ndarray], optimized_phone: np.ndarray, ground_truth: np.ndarray, title_suffix: str, out_dir: Path) -> Path:
     fig, ax = plt.subplots(figsize=(8, 7))
 
-    # Plot anchors
+    # Plot anchors (one scatter for all, labels per anchor)
+    anchor_xy = np.array([pos[:2] for pos in anchors.values()])
+    ax.scatter(anchor_xy[:, 0], anchor_xy[:, 1], marker='s', s=40, color='#9e9e9e', alpha=0.8, zorder=1)
     for aid, pos in anchors.items():
-        ax.scatter(pos[0], pos[1], marker='s', s=40, color='#9e9e9e', alpha=0.8, zorder=1)
         ax.text(pos[0] + 6, pos[1] + 6, f"A{aid}", color='#757575', fontsize=7, alpha=0.8)
 
     # Plot PGO point as a small pastel circle (no outline)
@@ -148,9 +170,10 @@ def plot_all_results(anchors: Dict[int, np.ndarray], all_results: List[Dict], ti
     """Plot multiple PGO results on a single plot."""
     fig, ax = plt.subplots(figsize=(10, 8))
 
-    # Plot anchors
+    # Plot anchors (one scatter for all, labels per anchor)
+    anchor_xy = np.array([pos[:2] for pos in anchors.values()])
+    ax.scatter(anchor_xy[:, 0], anchor_xy[:, 1], marker='s', s=40, color='#9e9e9e', alpha=0.8, zorder=1)
     for aid, pos in anchors.items():
-        ax.scatter(pos[0], pos[1], marker='s', s=40, color='#9e9e9e', alpha=0.8, zorder=1)
         ax.text(pos[0] + 6, pos[1] + 6, f"A{aid}", color='#757575', fontsize=7, alpha=0.8)
 
     # Assign colors by unique ground-truth (x,y); same GT gets same color
@@ -175,11 +198,14 @@ def plot_all_results(anchors: Dict[int, np.ndarray], all_results: List[Dict], ti
         # Round to avoid tiny float differences splitting colors
         return (float(np.round(gt_arr[0], 2)), float(np.round(gt_arr[1], 2)))
 
-    # Plot all PGO points and ground truth points
+    # Resolve colors and legend entries per result, then draw all PGO points and all
+    # ground truth stars with one scatter each
+    pgo_xy = np.array([result['optimized_phone'][:2] for result in all_results])
+    pgo_colors = []
+    gt_xy = []
+    legend_handles = []
     for result in all_results:
-        pos = result['optimized_phone']
         gt = result['ground_truth']
-        row_num = result['row_num']
 
         key = gt_key(gt)
         if key not in gt_key_to_color:
@@ -187,37 +213,47 @@ def plot_all_results(anchors: Dict[int, np.ndarray], all_results: List[Dict], ti
             gt_key_to_color[key] = color
             next_color_idx += 1
         color = gt_key_to_color[key]
+        pgo_colors.append(color)
+
+        gt_known = bool(np.all(np.isfinite(gt)))
+        if gt_known:
+            gt_xy.append(gt[:2])
 
         # Labels: one per unique GT for legend clarity
-        pgo_label = None
-        gt_label = None
         if key not in used_labels:
-            if np.all(np.isfinite(gt)):
+            if gt_known:
                 gt_label = f'GT ({key[0]:.2f},{key[1]:.2f})'
                 pgo_label = f'PGO for GT ({key[0]:.2f},{key[1]:.2f})'
             else:
-                gt_label = 'GT (unknown)'
+                gt_label = None  # no star is drawn for an unknown GT
                 pgo_label = 'PGO (unknown GT)'
+            legend_handles.append(Line2D([0], [0], linestyle='', marker='o', markersize=np.sqrt(45),
+                                         markeredgewidth=0, color=color, label=pgo_label))
+            if gt_label is not None:
+                legend_handles.append(Line2D([0], [0], linestyle='', marker='*', markersize=np.sqrt(70),
+                                             markerfacecolor='none', markeredgecolor='#424242',
+                                             markeredgewidth=0.8, label=gt_label))
             used_labels[key] = True
 
-        # Plot PGO point as a small pastel circle (no outline)
-        ax.scatter(pos[0], pos[1], marker='o', s=45, color=color,
-                   linewidths=0, label=pgo_label, zorder=5)
+    # Plot PGO points as small pastel circles (no outline)
+    ax.scatter(pgo_xy[:, 0], pgo_xy[:, 1], marker='o', s=45, c=pgo_colors,
+               linewidths=0, zorder=5)
 
-        # Plot ground truth as a star
-        if np.all(np.isfinite(gt)):
-            ax.scatter(
-                gt[0], gt[1],
-                marker='*', s=70,
-                facecolors='none', edgecolors='#424242', linewidths=0.8,
-                label=gt_label, zorder=6
-            )
+    # Plot ground truths as hollow stars
+    if gt_xy:
+        gt_xy = np.array(gt_xy)
+        ax.scatter(
+            gt_xy[:, 0], gt_xy[:, 1],
+            marker='*', s=70,
+            facecolors='none', edgecolors='#424242', linewidths=0.8,
+            zorder=6
+        )
 
     ax.set_xlabel('X (cm)')
     ax.set_ylabel('Y (cm)')
     ax.set_aspect('equal', adjustable='box')
     ax.grid(True, alpha=0.3)
-    ax.legend()
+    ax.legend(handles=legend_handles)
     ax.set_title(f'PGO Optimization Results - All Rows{title_suffix}')
 
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -228,6 +264,46 @@ def plot_all_results(anchors: Dict[int, np.ndarray], all_results: List[Dict], ti
     return out_path
 
 
+def summarize_results(row_indices: List[int], results) -> Tuple[Optional[Dict[int, np.ndarray]], List[Dict]]:
+    """
+    Print a summary per solved row and collect the results for plotting.
+    
+    Args:
+        row_indices: CSV row index of each result, in order
+        results: Iterable of solve_row outputs (consumed lazily, in order)
+        
+    Returns:
+        (anchors, all_results) where anchors come from the first row, or None if there were no rows
+    """
+    all_results = []
+    anchors = None
+    for row_idx, result in zip(row_indices, results):
+        gt = result['ground_truth']
+        pos = result['optimized_phone']
+        if anchors is None:
+            anchors = result['anchors']  # Use anchors from first row (they're all the same)
+
+        # Store result with row number for plotting
+        result_with_row = {
+            'ground_truth': gt,
+            'optimized_phone': pos,
+            'row_num': row_idx + 1,
+        }
+        all_results.append(result_with_row)
+
+        # Print concise summary
+        print(f"\n--- Row {row_idx + 1} ---")
+        if np.all(np.isfinite(gt)):
+            err_xy = float(np.linalg.norm(pos[:2] - gt[:2]))
+            err_3d = float(np.linalg.norm(pos - gt))
+            print(f"Optimized phone (x,y,z): {pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}")
+            print(f"Ground truth (x,y,z):  {gt[0]:.2f}, {gt[1]:.2f}, {gt[2]:.2f}")
+            print(f"Errors: XY={err_xy:.2f} cm, 3D={err_3d:.2f} cm")
+        else:
+            print(f"Optimized phone (x,y,z): {pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}")
+    return anchors, all_results
+
+
 def main():
     import argparse
 
@@ -238,6 +314,7 @@ def main():
     parser.add_argument('--positions', type=str, default=None, help='Comma-separated orientations to include (e.g., "A,B,C")')
     parser.add_argument('--outdir', type=str, default=str(Path(__file__).parent.parent), help='Directory to save plot')
     parser.add_argument('--anchors', type=str, default=None, help='Comma-separated anchor ids to use (e.g., "0,1")')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes for multi-row runs (default: CPU count)')
 
     args = parser.parse_args()
     csv_path = Path(args.csv)
@@ -268,10 +345,12 @@ def main():
         # Default to all rows
         row_indices = list(range(len(df)))
 
-    # Process each row and collect results
-    all_results = []
-    anchors = None
-    
+    # Pull only the needed columns out once; indexing df.iloc per row would build a
+    # full pd.Series for every processed row. Missing ground-truth columns become NaN
+    gt_columns = ['ground_truth_x', 'ground_truth_y', 'ground_truth_z']
+    gt_rows = df.reindex(columns=gt_columns).to_numpy(dtype=float)
+    binned_json_rows = df['filtered_binned_data_json'].tolist()
+
     allowed_anchor_ids: Optional[Set[int]] = None
     if args.anchors is not None and len(args.anchors.strip()) > 0:
         try:
@@ -280,38 +359,24 @@ def main():
             print(f"Invalid --anchors value: {args.anchors}. Expected comma-separated integers like '0,1'.")
             return
 
+    # Bounds check
+    valid_row_indices = []
     for row_idx in row_indices:
-        # Bounds check
         if row_idx < 0 or row_idx >= len(df):
             print(f"Row index {row_idx} out of range (0..{len(df)-1}), skipping...")
             continue
-
-        row = df.iloc[row_idx]
-        result = run_single_row_series(row, allowed_anchor_ids=allowed_anchor_ids)
-
-        gt = result['ground_truth']
-        pos = result['optimized_phone']
-        if anchors is None:
-            anchors = result['anchors']  # Use anchors from first row (they're all the same)
-
-        # Store result with row number for plotting
-        result_with_row = {
-            'ground_truth': gt,
-            'optimized_phone': pos,
-            'row_num': row_idx + 1,
-        }
-        all_results.append(result_with_row)
-
-        # Print concise summary
-        print(f"\n--- Row {row_idx + 1} ---")
-        if np.all(np.isfinite(gt)):
-            err_xy = float(np.linalg.norm(pos[:2] - gt[:2]))
-            err_3d = float(np.linalg.norm(pos - gt))
-            print(f"Optimized phone (x,y,z): {pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}")
-            print(f"Ground truth (x,y,z):  {gt[0]:.2f}, {gt[1]:.2f}, {gt[2]:.2f}")
-            print(f"Errors: XY={err_xy:.2f} cm, 3D={err_3d:.2f} cm")
-        else:
-            print(f"Optimized phone (x,y,z): {pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}")
+        valid_row_indices.append(row_idx)
+
+    # Rows are independent, so multi-row runs fan out over worker processes; each
+    # row's JSON is parsed exactly once, inside solve_row. Results come back in order
+    tasks = [(binned_json_rows[row_idx], gt_rows[row_idx], allowed_anchor_ids) for row_idx in valid_row_indices]
+    if args.jobs > 1 and len(tasks) > 1:
+        # The with block shuts the pool down even if a row or the summary raises mid-iteration
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks))) as executor:
+            results = executor.map(solve_row, tasks, chunksize=max(1, len(tasks) // (args.jobs * 4)))
+            anchors, all_results = summarize_results(valid_row_indices, results)
+    else:
+        anchors, all_results = summarize_results(valid_row_indices, map(solve_row, tasks))
 
     # Plot results
     if anchors is None or len(all_results) == 0:
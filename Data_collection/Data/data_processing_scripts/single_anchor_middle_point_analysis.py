@@ -10,11 +10,14 @@ for just the middle point position. It shows:
 4. Average error and standard deviation in the legend
 """
 
-import csv
-import json
+import io
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
 import matplotlib
+matplotlib.use('Agg')  # Figures are only saved, also from pool workers; never start a GUI backend
+import matplotlib.pyplot as plt
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 import sys
@@ -25,145 +28,199 @@ sys.path.append('/Users/hongyilin/projects/uwb-localization-mesh/packages')
 sys.path.append('/Users/hongyilin/projects/uwb-localization-mesh')
 
 from packages.datatypes.datatypes import AnchorConfig
-from packages.localization_algos.edge_creation.transforms import create_relative_measurement, ANCHOR_R
+from packages.localization_algos.edge_creation.transforms import ANCHOR_R, batch_transform
+from packages.datatypes.json_codec import json_loads
 
 # Default anchor positions (from datatypes README)
 DEFAULT_ANCHOR_POSITIONS = {
-    0: np.array([480, 600, 0]),  # top-right
-    1: np.array([0, 600, 0]),    # top-left  
-    2: np.array([480, 0, 0]),    # bottom-right
-    3: np.array([0, 0, 0])       # bottom-left
+    0: np.array([480, 600, 0], dtype=np.float32),  # top-right
+    1: np.array([0, 600, 0], dtype=np.float32),    # top-left  
+    2: np.array([480, 0, 0], dtype=np.float32),    # bottom-right
+    3: np.array([0, 0, 0], dtype=np.float32)       # bottom-left
 }
 
+# Measurements are noisy cm-scale vectors, so they are kept in float32; the anchor
+# rotations are cast once to match so the batched matmuls stay in single precision
+ANCHOR_R_F32 = {anchor_id: R.astype(np.float32) for anchor_id, R in ANCHOR_R.items()}
+
 # Target position - changed to (0, 0) to check for wider range
 TARGET_POINT = (0.0, 0.0)
 
-def load_data(csv_path: str) -> List[Dict]:
-    """Load and parse the CSV data."""
-    data = []
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                # Parse the raw_binned_data_json (non-filtered version)
-                raw_data = json.loads(row['raw_binned_data_json'])
-                row['raw_data'] = raw_data
-                
-                # Parse numeric fields
-                row['ground_truth_x'] = float(row['ground_truth_x'])
-                row['ground_truth_y'] = float(row['ground_truth_y'])
-                row['ground_truth_z'] = float(row['ground_truth_z'])
-                row['pgo_x'] = float(row['pgo_x'])
-                row['pgo_y'] = float(row['pgo_y'])
-                row['pgo_z'] = float(row['pgo_z'])
-                
-                data.append(row)
-            except (json.JSONDecodeError, KeyError, ValueError) as e:
-                print(f"Warning: Skipping row due to parsing error: {e}")
-                continue
-    return data
+# Text box styles, built once (matplotlib copies them, so they are never modified)
+GT_BBOX = dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.9)
+STATS_BBOX = dict(boxstyle='round,pad=0.5', facecolor='lightgray', alpha=0.9)
 
-def estimate_positions_single_anchor(measurements: Dict[str, List[List[float]]], 
-                                   anchor_id: int,
-                                   ground_truth: Tuple[float, float]) -> List[np.ndarray]:
-    """
-    Estimate multiple positions using a single anchor to capture measurement variability.
-    For 1-anchor case, we transform each measurement to global coordinates and place
-    the phone at the measured distance in the direction of ground truth.
-    This captures the variability within the bin for proper range calculation.
+# Per-row columns kept from the CSV (and in the cache) besides the measurements
+DATA_COLUMNS = ['ground_truth_x', 'ground_truth_y', 'ground_truth_z', 'pgo_x', 'pgo_y', 'pgo_z', 'orientation']
+
+def parse_data(csv_path: str) -> Tuple[pd.DataFrame, Dict[int, np.ndarray], np.ndarray]:
+    """Parse the CSV into its per-row columns and per-anchor measurement buffers.
+    
+    Returns the DataFrame of DATA_COLUMNS, a dict of anchor_id -> (N_total, 3) float32
+    buffer, and an (P, 4) array of (row, anchor_id, start, end) slices into the buffers.
     """
-    anchor_id_str = str(anchor_id)
-    if anchor_id_str not in measurements:
-        return []
-    
-    vectors = measurements[anchor_id_str]
-    if not vectors:
-        return []
-    
-    # Transform measurements to global coordinates
-    global_vectors = []
-    for vector in vectors:
-        local_vector = np.array(vector)
-        try:
-            _, _, global_vector = create_relative_measurement(anchor_id, 0, local_vector)
-            global_vectors.append(global_vector)
-        except ValueError:
+    # C-level CSV parsing instead of DictReader + float() per field; the pyarrow engine
+    # parses multi-threaded when installed
+    read_kwargs = dict(usecols=DATA_COLUMNS + ['raw_binned_data_json'], dtype={'orientation': 'category'})
+    try:
+        df = pd.read_csv(csv_path, engine='pyarrow', **read_kwargs)
+    except ImportError:
+        df = pd.read_csv(csv_path, **read_kwargs)
+    
+    # Numeric columns are coerced rather than typed at read time, so one malformed cell
+    # skips its row (as float() per field did) instead of failing the whole load
+    numeric_columns = DATA_COLUMNS[:6]
+    for column in numeric_columns:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype(np.float64)
+    numeric_ok = df[numeric_columns].notna().all(axis=1).to_numpy()
+    
+    # Parse the raw_binned_data_json (non-filtered version), skipping unparseable rows
+    raw_data = []
+    for row_ok, blob in zip(numeric_ok, df['raw_binned_data_json'].tolist()):
+        if not row_ok:
+            print("Warning: Skipping row due to parsing error: missing or non-numeric position value")
+            raw_data.append(None)
             continue
+        try:
+            binned_data = json_loads(blob)
+            for anchor_id_str in binned_data.get('measurements', {}):
+                int(anchor_id_str)
+            raw_data.append(binned_data)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Warning: Skipping row due to parsing error: {e}")
+            raw_data.append(None)
+    parsed = np.array([binned_data is not None for binned_data in raw_data], dtype=bool)
+    df = df.loc[parsed, DATA_COLUMNS].reset_index(drop=True)
+    raw_data = [binned_data for binned_data in raw_data if binned_data is not None]
+    
+    # Lay the measurements out per anchor rather than per row: every anchor's vectors
+    # from all rows go into one buffer, and each row keeps (start, end) offsets into it
+    anchor_lists = defaultdict(list)
+    slices = []
+    for row_id, binned_data in enumerate(raw_data):
+        for anchor_id_str, vectors in binned_data.get('measurements', {}).items():
+            anchor_id = int(anchor_id_str)
+            anchor_list = anchor_lists[anchor_id]
+            start = len(anchor_list)
+            anchor_list.extend(vector for vector in vectors if len(vector) == 3)
+            slices.append((row_id, anchor_id, start, len(anchor_list)))
+    
+    anchor_buffers = {anchor_id: np.asarray(vectors, dtype=np.float32).reshape(-1, 3)
+                      for anchor_id, vectors in anchor_lists.items()}
+    return df, anchor_buffers, np.array(slices, dtype=np.int64).reshape(-1, 4)
+
+def load_data(csv_path: str) -> pd.DataFrame:
+    """Load the parsed CSV data from its .npz sidecar, parsing the CSV if missing or stale.
     
-    if not global_vectors:
-        return []
-    
-    # Estimate position for each measurement to capture variability
+    Each row's raw measurements are returned in the 'anchor_vectors' column, a dict of
+    anchor_id -> (N, 3) view into one contiguous buffer per anchor.
+    """
+    cache_path = os.path.splitext(csv_path)[0] + '_raw_anchor_measurements.npz'
+    
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        with np.load(cache_path) as cached:
+            df = pd.DataFrame({column: cached[column] for column in DATA_COLUMNS})
+            anchor_buffers = {int(key[len('buffer_'):]): cached[key]
+                              for key in cached.files if key.startswith('buffer_')}
+            slices = cached['slices']
+        df['orientation'] = df['orientation'].astype('category')
+        print(f"Loaded cached measurements from {cache_path}")
+    else:
+        df, anchor_buffers, slices = parse_data(csv_path)
+        # Orientation is stored as a fixed-width string array so the cache loads without pickle
+        arrays = {column: df[column].to_numpy() for column in DATA_COLUMNS}
+        arrays['orientation'] = arrays['orientation'].astype(str)
+        arrays.update({f'buffer_{anchor_id}': buffer for anchor_id, buffer in anchor_buffers.items()})
+        np.savez(cache_path, slices=slices, **arrays)
+        print(f"Cached parsed measurements to {cache_path}")
+    
+    anchor_vectors = [{} for _ in range(len(df))]
+    for row_id, anchor_id, start, end in slices.tolist():
+        anchor_vectors[row_id][anchor_id] = anchor_buffers[anchor_id][start:end]
+    
+    return df.assign(anchor_vectors=anchor_vectors)
+
+def ground_truth_direction(anchor_id: int, ground_truth: Tuple[float, float]) -> np.ndarray:
+    """Unit (float32) 2D direction from an anchor to the ground truth position."""
     anchor_pos_2d = DEFAULT_ANCHOR_POSITIONS[anchor_id][:2]
-    ground_truth_2d = np.array(ground_truth)
+    ground_truth_2d = np.array(ground_truth, dtype=np.float32)
     
-    # Direction from anchor to ground truth
     direction = ground_truth_2d - anchor_pos_2d
     if np.linalg.norm(direction) > 0:
-        direction = direction / np.linalg.norm(direction)
-    else:
-        # If ground truth is at anchor position, use arbitrary direction
-        direction = np.array([1.0, 0.0])
-    
-    # Create position estimates for each measurement
-    estimated_positions = []
-    for global_vector in global_vectors:
-        distance = np.linalg.norm(global_vector)
-        # Place phone at measured distance in ground truth direction
-        estimated_pos = anchor_pos_2d + direction * distance
-        estimated_positions.append(estimated_pos)
-    
-    return estimated_positions
+        return direction / np.linalg.norm(direction)
+    # If ground truth is at anchor position, use arbitrary direction
+    return np.array([1.0, 0.0], dtype=np.float32)
+
+def estimate_positions_single_anchor(anchor_vectors: Dict[int, np.ndarray], 
+                                   anchor_id: int,
+                                   direction: np.ndarray) -> np.ndarray:
+    """
+    Estimate multiple positions using a single anchor to capture measurement variability.
+    For 1-anchor case, we transform each measurement to global coordinates and place
+    the phone at the measured distance in the direction of ground truth.
+    This captures the variability within the bin for proper range calculation.
+    
+    direction is the anchor's ground_truth_direction, computed once by the caller.
+    Returns an (N, 2) array of estimated positions (empty if there are no measurements).
+    """
+    no_estimates = np.empty((0, 2))
+    local_vectors = anchor_vectors.get(anchor_id)
+    if local_vectors is None or not len(local_vectors):
+        return no_estimates
+    
+    if anchor_id not in ANCHOR_R_F32:
+        return no_estimates
+    
+    # Transform all measurements to global coordinates in one (N, 3) @ R.T matmul
+    # (same rotation as create_relative_measurement)
+    global_vectors = local_vectors @ ANCHOR_R_F32[anchor_id].T
+    
+    # Place the phone at each measured distance in the ground truth direction
+    # (one estimate per measurement to capture variability)
+    distances = np.sqrt(np.einsum('ij,ij->i', global_vectors, global_vectors))
+    return DEFAULT_ANCHOR_POSITIONS[anchor_id][:2] + distances[:, None] * direction
 
 def analyze_single_anchor_performance(data_group: List[Dict], 
                                     ground_truth: Tuple[float, float]) -> Dict[int, Dict]:
     """Analyze single anchor performance for each available anchor."""
     
-    # Get all available anchors from the data
-    all_available_anchors = set()
+    # Bucket rows by the anchors they contain in a single pass over the data
+    rows_by_anchor = defaultdict(list)
     for row in data_group:
-        available_anchors = list(map(int, row['raw_data']['measurements'].keys()))
-        all_available_anchors.update(available_anchors)
+        for anchor_id in row['anchor_vectors']:
+            rows_by_anchor[anchor_id].append(row)
     
-    all_anchor_ids = sorted(list(all_available_anchors))
+    all_anchor_ids = sorted(rows_by_anchor)
     print(f"Available anchors for target point: {all_anchor_ids}")
     
     anchor_performance = {}
     
     for anchor_id in all_anchor_ids:
-        all_positions = []
-        all_errors = []
+        if anchor_id not in ANCHOR_R_F32:
+            continue
+        # The ground truth direction is fixed per anchor, so compute it once here
+        direction = ground_truth_direction(anchor_id, ground_truth)
         
-        for row in data_group:
-            available_anchors = list(map(int, row['raw_data']['measurements'].keys()))
-            if anchor_id not in available_anchors:
-                continue
-            
-            pos_estimates = estimate_positions_single_anchor(
-                row['raw_data']['measurements'], 
-                anchor_id, 
-                ground_truth
-            )
-            
-            for pos_estimate in pos_estimates:
-                all_positions.append(pos_estimate)
-                error = np.sqrt((pos_estimate[0] - ground_truth[0])**2 + 
-                               (pos_estimate[1] - ground_truth[1])**2)
-                all_errors.append(error)
+        # One (N_i, 2) estimate array per row, concatenated once per anchor
+        per_row_positions = [
+            estimate_positions_single_anchor(row['anchor_vectors'], anchor_id, direction)
+            for row in rows_by_anchor[anchor_id]
+        ]
+        positions_array = np.concatenate(per_row_positions, axis=0)
         
-        if all_positions and all_errors:
-            positions_array = np.array(all_positions)
+        if len(positions_array):
+            # Errors for all estimates in one call
+            all_errors = np.hypot(positions_array[:, 0] - ground_truth[0],
+                                  positions_array[:, 1] - ground_truth[1])
             
-            # Calculate statistics
-            mean_x = np.mean(positions_array[:, 0])
-            mean_y = np.mean(positions_array[:, 1])
-            min_x = np.min(positions_array[:, 0])
-            max_x = np.max(positions_array[:, 0])
-            min_y = np.min(positions_array[:, 1])
-            max_y = np.max(positions_array[:, 1])
+            # Calculate statistics, one reduction over both columns each
+            # (means accumulated in float64 over the float32 estimates)
+            mean_x, mean_y = positions_array.mean(axis=0, dtype=np.float64)
+            min_x, min_y = positions_array.min(axis=0)
+            max_x, max_y = positions_array.max(axis=0)
             
-            avg_error = np.mean(all_errors)
-            std_error = np.std(all_errors)
+            avg_error = all_errors.mean()
+            std_error = all_errors.std()
             
             anchor_performance[anchor_id] = {
                 'positions': positions_array,
@@ -172,25 +229,70 @@ def analyze_single_anchor_performance(data_group: List[Dict],
                 'y_range': (min_y, max_y),
                 'avg_error': avg_error,
                 'std_error': std_error,
-                'num_estimates': len(all_positions)
+                'num_estimates': len(positions_array)
             }
             
-            print(f"Anchor {anchor_id}: {len(all_positions)} estimates, avg error: {avg_error:.1f}±{std_error:.1f}cm")
+            print(f"Anchor {anchor_id}: {len(positions_array)} estimates, avg error: {avg_error:.1f}±{std_error:.1f}cm")
             print(f"  X range: {min_x:.1f} to {max_x:.1f} cm (span: {max_x-min_x:.1f}cm)")
             print(f"  Y range: {min_y:.1f} to {max_y:.1f} cm (span: {max_y-min_y:.1f}cm)")
     
     return anchor_performance
 
-def create_single_anchor_plot(orientation: str, data: List[Dict], output_dir: str):
-    """Create a plot showing single anchor performance for the target point."""
+def build_base_axes():
+    """
+    Create the figure parts that are the same for every orientation: anchors, ground
+    truth, axis labels, grid and limits.
+    
+    Returns (fig, ax, anchor_artists) where anchor_artists maps anchor_id to its
+    (marker, label) artists, restyled per plot to highlight the worst anchor.
+    """
+    fig, ax = plt.subplots(figsize=(12, 10))
+    
+    # Plot anchor positions
+    anchor_artists = {}
+    for anchor_id, pos in DEFAULT_ANCHOR_POSITIONS.items():
+        marker, = ax.plot(pos[0], pos[1], 's', zorder=10)
+        text = ax.annotate(f'A{anchor_id}', (pos[0], pos[1]), xytext=(8, 8), 
+                          textcoords='offset points', fontsize=12, zorder=11)
+        anchor_artists[anchor_id] = (marker, text)
     
-    # Filter data for target point and specified orientation
-    target_point_data = []
-    for row in data:
-        if (abs(row['ground_truth_x'] - TARGET_POINT[0]) < 0.1 and 
-            abs(row['ground_truth_y'] - TARGET_POINT[1]) < 0.1 and
-            row['orientation'] == orientation):
-            target_point_data.append(row)
+    # Plot ground truth position
+    ax.plot(TARGET_POINT[0], TARGET_POINT[1], 'ko', markersize=10, 
+            label='Ground Truth', zorder=8)
+    ax.annotate(f'GT({TARGET_POINT[0]:.0f},{TARGET_POINT[1]:.0f})', 
+               (TARGET_POINT[0], TARGET_POINT[1]), xytext=(10, -20), 
+               textcoords='offset points', fontsize=12, 
+               bbox=GT_BBOX,
+               zorder=9)
+    
+    # Formatting
+    ax.set_xlabel('X Position (cm)', fontsize=14)
+    ax.set_ylabel('Y Position (cm)', fontsize=14)
+    ax.grid(True, alpha=0.3)
+    
+    # Set equal aspect ratio and fixed limits to avoid text blocking
+    ax.set_aspect('equal')
+    
+    # Set fixed plot limits as requested
+    ax.set_xlim(0, 800)
+    ax.set_ylim(0, 700)
+    
+    return fig, ax, anchor_artists
+
+def create_single_anchor_plot(orientation: str, data: pd.DataFrame, output_dir: str, base_axes=None):
+    """
+    Create a plot showing single anchor performance for the target point.
+    
+    base_axes is an optional build_base_axes() result to draw into; the artists added
+    for this orientation are removed again after saving so it can be reused.
+    """
+    
+    # Filter data for target point and specified orientation with one vectorized mask;
+    # only the matching rows are turned into per-row dicts for the analysis below
+    mask = ((np.abs(data['ground_truth_x'] - TARGET_POINT[0]) < 0.1) &
+            (np.abs(data['ground_truth_y'] - TARGET_POINT[1]) < 0.1) &
+            (data['orientation'] == orientation))
+    target_point_data = data[mask].to_dict('records')
     
     if not target_point_data:
         print(f"Warning: No data found for target point {TARGET_POINT} with orientation {orientation}")
@@ -213,62 +315,59 @@ def create_single_anchor_plot(orientation: str, data: List[Dict], output_dir: st
     
     print(f"\nWorst performing anchor: {worst_anchor} (avg error: {worst_perf['avg_error']:.1f}cm)")
     
-    # Set up the plot
-    fig, ax = plt.subplots(figsize=(12, 10))
+    # Set up the plot on the shared base axes (or a fresh one)
+    own_figure = base_axes is None
+    fig, ax, anchor_artists = build_base_axes() if own_figure else base_axes
+    base_children = set(ax.get_children())
     
-    # Plot anchor positions
-    for anchor_id, pos in DEFAULT_ANCHOR_POSITIONS.items():
+    # Restyle the anchor positions to highlight the worst anchor
+    for anchor_id, (marker, text) in anchor_artists.items():
         color = 'red' if anchor_id == worst_anchor else 'lightcoral'
-        size = 15 if anchor_id == worst_anchor else 10
-        ax.plot(pos[0], pos[1], 's', markersize=size, color=color, 
-                label='Worst Anchor' if anchor_id == worst_anchor else '', zorder=10)
-        ax.annotate(f'A{anchor_id}', (pos[0], pos[1]), xytext=(8, 8), 
-                   textcoords='offset points', fontsize=12, color=color, 
-                   fontweight='bold' if anchor_id == worst_anchor else 'normal', zorder=11)
-    
-    # Plot ground truth position
-    ax.plot(TARGET_POINT[0], TARGET_POINT[1], 'ko', markersize=10, 
-            label='Ground Truth', zorder=8)
-    ax.annotate(f'GT({TARGET_POINT[0]:.0f},{TARGET_POINT[1]:.0f})', 
-               (TARGET_POINT[0], TARGET_POINT[1]), xytext=(10, -20), 
-               textcoords='offset points', fontsize=12, 
-               bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.9),
-               zorder=9)
+        marker.set_color(color)
+        marker.set_markersize(15 if anchor_id == worst_anchor else 10)
+        marker.set_label('Worst Anchor' if anchor_id == worst_anchor else '')
+        text.set_color(color)
+        text.set_fontweight('bold' if anchor_id == worst_anchor else 'normal')
     
     # Plot all individual measurements from raw data (like in overview plot)
     node_colors = {0: 'red', 1: 'blue', 2: 'lightgreen', 3: 'orange'}
     node_labels = {0: 'Node 0', 1: 'Node 1', 2: 'Node 2', 3: 'Node 3'}
     
+    # Gather the local vectors per node across all rows, then transform and plot each
+    # node with a single matmul and a single scatter call
+    node_local_vectors = {node_id: [] for node_id in node_colors}
     for row in target_point_data:
         try:
-            measurements = row['raw_data']['measurements']
-            
-            for node_id_str, node_measurements in measurements.items():
-                node_id = int(node_id_str)
-                
-                # Transform measurements to global coordinates and plot
-                for measurement in node_measurements:
-                    local_vec = np.array(measurement)
-                    global_vec = ANCHOR_R[node_id] @ local_vec
-                    phone_pos = DEFAULT_ANCHOR_POSITIONS[node_id] + global_vec
-                    
-                    # Highlight worst anchor measurements
-                    alpha = 0.8 if node_id == worst_anchor else 0.3
-                    size = 40 if node_id == worst_anchor else 20
-                    zorder = 6 if node_id == worst_anchor else 4
-                    
-                    ax.scatter(phone_pos[0], phone_pos[1], 
-                              color=node_colors[node_id], alpha=alpha, s=size, 
-                              zorder=zorder)
+            for node_id, local_vecs in row['anchor_vectors'].items():
+                node_local_vectors[node_id].append(local_vecs)
         
-        except (KeyError, ValueError) as e:
+        except KeyError as e:
             print(f"Warning: Could not parse measurements: {e}")
             continue
     
+    # Transform every node's measurements in one batched call, then split back per node
+    plotted_nodes = [node_id for node_id, local_chunks in node_local_vectors.items() if local_chunks]
+    node_vectors = [np.concatenate(node_local_vectors[node_id]) for node_id in plotted_nodes]
+    node_counts = [len(vectors) for vectors in node_vectors]
+    if plotted_nodes:
+        global_vectors = batch_transform(np.concatenate(node_vectors), np.repeat(plotted_nodes, node_counts))
+    else:
+        global_vectors = np.empty((0, 3))
+    
+    for node_id, node_global in zip(plotted_nodes, np.split(global_vectors, np.cumsum(node_counts)[:-1])):
+        phone_positions = node_global + DEFAULT_ANCHOR_POSITIONS[node_id]
+        
+        # Highlight worst anchor measurements; rasterized so a vector savefig embeds each
+        # node's cloud as one image while anchors, text and range bars stay vector
+        is_worst = node_id == worst_anchor
+        ax.scatter(phone_positions[:, 0], phone_positions[:, 1], 
+                  color=node_colors[node_id], alpha=0.8 if is_worst else 0.3, 
+                  s=40 if is_worst else 20, zorder=6 if is_worst else 4, rasterized=True)
+    
     # Add legend entries for measurements
     legend_elements = []
     for node_id in sorted(node_colors.keys()):
-        if any(str(node_id) in row['raw_data']['measurements'] for row in target_point_data):
+        if any(node_id in row['anchor_vectors'] for row in target_point_data):
             alpha = 0.8 if node_id == worst_anchor else 0.6
             label_suffix = ' (Worst)' if node_id == worst_anchor else ''
             legend_elements.append(
@@ -304,16 +403,11 @@ def create_single_anchor_plot(orientation: str, data: List[Dict], output_dir: st
                  f"• Y Range: {y_range_extent:.1f} cm")
     
     ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, fontsize=11,
-            verticalalignment='top', bbox=dict(boxstyle='round,pad=0.5', 
-            facecolor='lightgray', alpha=0.9))
+            verticalalignment='top', bbox=STATS_BBOX)
     
-    # Formatting
-    ax.set_xlabel('X Position (cm)', fontsize=14)
-    ax.set_ylabel('Y Position (cm)', fontsize=14)
     ax.set_title(f'Single Anchor Performance (Raw Data) - Position {TARGET_POINT} - Orientation {orientation}\n'
                 f'Worst Case: Anchor {worst_anchor} (Avg Error: {worst_perf["avg_error"]:.1f}cm)', 
                 fontsize=16)
-    ax.grid(True, alpha=0.3)
     
     # Create combined legend
     anchor_legend = ax.get_legend_handles_labels()
@@ -321,21 +415,44 @@ def create_single_anchor_plot(orientation: str, data: List[Dict], output_dir: st
     all_legend_labels = anchor_legend[1] + [elem.get_label() for elem in legend_elements]
     ax.legend(all_legend_elements, all_legend_labels, loc='upper right', fontsize=10)
     
-    # Set equal aspect ratio and fixed limits to avoid text blocking
-    ax.set_aspect('equal')
-    
-    # Set fixed plot limits as requested
-    ax.set_xlim(0, 800)
-    ax.set_ylim(0, 700)
-    
     # Save plot
     output_path = os.path.join(output_dir, f'single_anchor_position_0_0_raw_orientation_{orientation}.png')
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=300, bbox_inches='tight')
+    
+    if own_figure:
+        plt.close(fig)
+    else:
+        # Strip this orientation's artists (range bars first, as a container) from the base
+        for container in list(ax.containers):
+            container.remove()
+        for artist in ax.get_children():
+            if artist not in base_children:
+                artist.remove()
     
     print(f"\nSaved single anchor plot (raw data) for orientation {orientation} to {output_path}")
 
+# Per-worker state for the orientation pool, set once by init_plot_worker so the data
+# is sent to each worker process once rather than with every task
+_worker_state = {}
+
+def init_plot_worker(data: pd.DataFrame, output_dir: str):
+    """Pool initializer: keep the loaded data and a base figure in this process."""
+    _worker_state['data'] = data
+    _worker_state['output_dir'] = output_dir
+    _worker_state['base_axes'] = build_base_axes()
+
+def plot_orientation(orientation: str) -> str:
+    """Generate one orientation's plot and return its captured console output."""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        print(f"\n{'='*60}")
+        print(f"Generating single anchor analysis for orientation {orientation}...")
+        print(f"{'='*60}")
+        create_single_anchor_plot(orientation, _worker_state['data'], _worker_state['output_dir'],
+                                  _worker_state['base_axes'])
+    return log.getvalue()
+
 def main():
     """Main function to generate single anchor analysis for target point."""
     
@@ -348,15 +465,22 @@ def main():
     print(f"Loaded {len(data)} data points")
     
     # Get unique orientations
-    orientations = sorted(set(row['orientation'] for row in data))
+    orientations = sorted(data['orientation'].unique())
     print(f"Found orientations: {orientations}")
     
-    # Generate single anchor plot for each orientation
-    for orientation in orientations:
-        print(f"\n{'='*60}")
-        print(f"Generating single anchor analysis for orientation {orientation}...")
-        print(f"{'='*60}")
-        create_single_anchor_plot(orientation, data, output_dir)
+    # Orientations are independent, so plot them in parallel worker processes (each
+    # reusing its own base figure); logs are printed in orientation order
+    workers = min(len(orientations), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_plot_worker,
+                                 initargs=(data, output_dir)) as executor:
+            for log in executor.map(plot_orientation, orientations):
+                print(log, end='')
+    else:
+        init_plot_worker(data, output_dir)
+        for orientation in orientations:
+            print(plot_orientation(orientation), end='')
+        plt.close(_worker_state['base_axes'][0])
     
     print(f"\n{'='*60}")
     print(f"All single anchor plots generated successfully in {output_dir}")
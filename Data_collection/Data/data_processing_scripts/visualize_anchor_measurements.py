@@ -4,7 +4,6 @@ Script to visualize measurements from all 4 anchors for a specific position.
 Shows raw measurements without PGO processing.
 """
 
-import json
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -15,7 +14,8 @@ import sys
 # Make `packages/` importable
 sys.path.append(str(Path(__file__).parent.parent.parent.parent / 'packages'))
 
-from localization_algos.edge_creation.transforms import create_relative_measurement
+from localization_algos.edge_creation.transforms import batch_transform
+from datatypes.json_codec import json_loads
 
 def get_default_anchor_positions() -> Dict[int, np.ndarray]:
     """Ground-truth anchor positions (cm) in room frame."""
@@ -26,47 +26,42 @@ def get_default_anchor_positions() -> Dict[int, np.ndarray]:
         3: np.array([0.0,     0.0, 0.0]),  # bottom-left
     }
 
-def load_data_for_position(csv_path: str, target_x: float, target_y: float, orientation: str) -> List[Dict]:
+def load_data_for_position(csv_path: str, target_x: float, target_y: float, orientation: str) -> pd.DataFrame:
     """Load data for a specific ground truth position and orientation."""
-    df = pd.read_csv(csv_path)
+    # Only the filter columns and the filtered JSON are ever used
+    df = pd.read_csv(csv_path, usecols=['ground_truth_x', 'ground_truth_y', 'orientation',
+                                        'filtered_binned_data_json'])
     
     # Filter for the specific position and orientation
-    filtered_df = df[
+    return df[
         (df['ground_truth_x'] == target_x) & 
         (df['ground_truth_y'] == target_y) & 
         (df['orientation'] == orientation)
     ]
-    
-    return filtered_df.to_dict('records')
 
-def extract_measurements(row: Dict) -> Dict[int, List[np.ndarray]]:
-    """Extract measurements from filtered_binned_data_json."""
-    binned_data_str = row['filtered_binned_data_json']
-    binned_data = json.loads(binned_data_str)
+def extract_measurements(binned_data_str: str) -> Dict[int, List[np.ndarray]]:
+    """Extract measurements from one filtered_binned_data_json string."""
+    binned_data = json_loads(binned_data_str)
     
     measurements = {}
     for anchor_id_str, vectors in binned_data['measurements'].items():
         anchor_id = int(anchor_id_str)
-        measurements[anchor_id] = [np.array(vec) for vec in vectors]
+        measurements[anchor_id] = [np.asarray(vec, dtype=np.float32) for vec in vectors]
     
     return measurements
 
 def transform_to_global(measurements: Dict[int, List[np.ndarray]], phone_node_id: int = 0) -> Dict[int, np.ndarray]:
     """Transform local measurements to global coordinates and return bin means."""
-    global_bin_means = {}
+    anchor_ids = [anchor_id for anchor_id, vectors in measurements.items() if vectors]
+    if not anchor_ids:
+        return {}
     
-    for anchor_id, vectors in measurements.items():
-        if not vectors:
-            continue
-            
-        # Calculate mean of the bin first (in local coordinates)
-        local_mean = np.mean(vectors, axis=0)
-        
-        # Transform the bin mean to global coordinates
-        _, _, global_mean = create_relative_measurement(anchor_id, phone_node_id, local_mean)
-        global_bin_means[anchor_id] = global_mean
+    # Calculate mean of each bin first (in local coordinates)
+    local_means = np.stack([np.mean(measurements[anchor_id], axis=0) for anchor_id in anchor_ids])
     
-    return global_bin_means
+    # Transform all bin means to global coordinates in one batched call
+    global_means = batch_transform(local_means, np.array(anchor_ids))
+    return dict(zip(anchor_ids, global_means))
 
 def visualize_measurements(
     anchor_positions: Dict[int, np.ndarray],
@@ -199,7 +194,7 @@ def main():
     print(f"Loading data for position ({target_x}, {target_y}) orientation {orientation}...")
     data_rows = load_data_for_position(csv_path, target_x, target_y, orientation)
     
-    if not data_rows:
+    if data_rows.empty:
         print(f"No data found for position ({target_x}, {target_y}) orientation {orientation}")
         return
     
@@ -210,8 +205,8 @@ def main():
     
     # Collect bin means from all rows
     all_bin_means = {}
-    for row in data_rows:
-        measurements = extract_measurements(row)
+    for binned_data_str in data_rows['filtered_binned_data_json'].tolist():
+        measurements = extract_measurements(binned_data_str)
         global_bin_means = transform_to_global(measurements)  # Now returns bin means
         
         # Combine with existing bin means
@@ -2,13 +2,15 @@
 Data collection server that extends ServerBringUp with data collection capabilities.
 """
 
+import atexit
 import csv
-import json
 import logging
 import threading
+import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 
 import numpy as np
 from rich.console import Console
@@ -20,25 +22,28 @@ from rich.text import Text
 from packages.datatypes.datatypes import Measurement, BinnedData
 from packages.localization_algos.binning.sliding_window import SlidingWindowBinner
 from packages.uwb_mqtt_server.config import MQTTConfig
+from packages.datatypes.json_codec import json_dumps
 from Server_bring_up import ServerBringUp
 
+def _csv_quote(field: str) -> str:
+    """Quote a CSV field the way csv.writer does for values containing quotes or commas."""
+    return '"' + field.replace('"', '""') + '"'
+
 # Custom handler that only keeps last N records
 class LastNHandler(logging.Handler):
     def __init__(self, n=5):
         super().__init__()
         self.n = n
-        self.records = []
+        self.records = deque(maxlen=n)  # Oldest record drops off automatically
         
     def emit(self, record):
         try:
             self.records.append(self.format(record))
-            if len(self.records) > self.n:
-                self.records.pop(0)
         except Exception:
             self.handleError(record)
             
     def get_records(self):
-        return self.records
+        return list(self.records)
 
 class DataCollectionServer(ServerBringUp):
     """
@@ -48,6 +53,17 @@ class DataCollectionServer(ServerBringUp):
     3. Variance analysis
     4. CSV/JSON data storage
     """
+
+    # Row templates matching the _init_csv_files headers; '{}' keeps str() precision like csv.writer,
+    # and the JSON fields are passed through _csv_quote. Orientation labels come from the A/B/C prompt.
+    _DP_FMT = (
+        "{ts},{gx},{gy},{gz},{px},{py},{pz},{ori},"
+        "{filtered},{raw},{total},{rejected},{late},{reasons}\r\n"
+    )
+    _VAR_FMT = (
+        "{ts},{gx},{gy},{gz},{px},{py},{pz},{ori},"
+        "{vx},{vy},{vz},{cxy},{cxz},{cyz}\r\n"
+    )
     
     def __init__(
         self,
@@ -77,6 +93,12 @@ class DataCollectionServer(ServerBringUp):
         
         self._init_csv_files()
 
+        # Keep both CSVs open for the server's lifetime instead of reopening them per row
+        self._dp_fh = open(self.datapoints_file, 'ab', buffering=1 << 16)
+        self._var_fh = open(self.variance_file, 'ab', buffering=1 << 16)
+        self._csv_lock = threading.Lock()  # Serializes row writes against _close_csv_files
+        atexit.register(self._close_csv_files)
+
         # Add command processing thread
         self._command_thread = threading.Thread(
             target=self._process_commands,
@@ -110,15 +132,12 @@ class DataCollectionServer(ServerBringUp):
     
     @staticmethod
     def _binned_data_to_json_dict(binned_data: BinnedData) -> dict:
-        """Convert BinnedData to a JSON-serializable dictionary."""
+        """Convert BinnedData to a dictionary for json_dumps (measurement vectors stay ndarrays)."""
         return {
             'bin_start_time': binned_data.bin_start_time,
             'bin_end_time': binned_data.bin_end_time,
             'phone_node_id': binned_data.phone_node_id,
-            'measurements': {
-                anchor_id: [vec.tolist() for vec in vectors]
-                for anchor_id, vectors in binned_data.measurements.items()
-            }
+            'measurements': dict(binned_data.measurements)
         }
         
     def _setup_logging(self):
@@ -226,7 +245,7 @@ class DataCollectionServer(ServerBringUp):
         pgo_measurement = self.user_position.copy()
         
         # Save to CSV
-        timestamp = datetime.utcnow().timestamp()
+        timestamp = time.time()
 
         # Get both filtered and raw binned data
         filtered_binned = latest_binned
@@ -245,20 +264,18 @@ class DataCollectionServer(ServerBringUp):
         if hasattr(self, '_filtered_binners') and phone_id in self._filtered_binners:
             filtered_metrics = self._filtered_binners[phone_id].get_metrics()
 
-        with open(self.datapoints_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                timestamp,
-                ground_truth[0], ground_truth[1], ground_truth[2],
-                pgo_measurement[0], pgo_measurement[1], pgo_measurement[2],
-                orientation,
-                json.dumps(self._binned_data_to_json_dict(filtered_binned)) if filtered_binned else "{}",
-                json.dumps(self._binned_data_to_json_dict(raw_binned)) if raw_binned else "{}",
-                filtered_metrics.total_measurements if filtered_metrics else 0,
-                filtered_metrics.rejected_measurements if filtered_metrics else 0,
-                filtered_metrics.late_drops if filtered_metrics else 0,
-                json.dumps(dict(filtered_metrics.rejection_reasons) if filtered_metrics else {})
-            ])
+        self._write_row(self._dp_fh, self._DP_FMT.format(
+            ts=timestamp,
+            gx=ground_truth[0], gy=ground_truth[1], gz=ground_truth[2],
+            px=pgo_measurement[0], py=pgo_measurement[1], pz=pgo_measurement[2],
+            ori=orientation,
+            filtered=_csv_quote(json_dumps(self._binned_data_to_json_dict(filtered_binned)) if filtered_binned else "{}"),
+            raw=_csv_quote(json_dumps(self._binned_data_to_json_dict(raw_binned)) if raw_binned else "{}"),
+            total=filtered_metrics.total_measurements if filtered_metrics else 0,
+            rejected=filtered_metrics.rejected_measurements if filtered_metrics else 0,
+            late=filtered_metrics.late_drops if filtered_metrics else 0,
+            reasons=_csv_quote(json_dumps(dict(filtered_metrics.rejection_reasons) if filtered_metrics else {}))
+        ))
             
         return pgo_measurement, latest_binned
 
@@ -279,28 +296,32 @@ class DataCollectionServer(ServerBringUp):
         Returns:
             (current_position, variance_stats) tuple
         """
-        # Collect positions over window
-        positions: List[np.ndarray] = []
-        start_time = datetime.utcnow().timestamp()
+        # Collect one position per PGO update over the window (monotonic clock, immune to wall-clock jumps),
+        # folding each sample into the running mean and co-moment matrix as it arrives
+        n = 0
+        mean = np.zeros(3)
+        M2 = np.zeros((3, 3))  # Co-moment matrix (sum of outer products of deviations)
+        current_pos = None
+        deadline = time.monotonic() + window_seconds
         
-        while (datetime.utcnow().timestamp() - start_time) < window_seconds:
-            if self.user_position is not None:
-                positions.append(self.user_position.copy())
-            import time
-            time.sleep(0.1)  # Sample at 10Hz
+        with self._position_cond:
+            remaining = window_seconds
+            while remaining > 0:
+                # wait() returns True only when notified, i.e. a new position was published
+                if self._position_cond.wait(timeout=remaining):
+                    current_pos = self.user_position.copy()
+                    n += 1
+                    delta = current_pos - mean
+                    mean += delta / n
+                    M2 += np.outer(delta, current_pos - mean)
+                remaining = deadline - time.monotonic()
             
-        if not positions:
+        if n == 0:
             raise RuntimeError("No positions collected in window")
             
-        # Calculate statistics
-        positions_array = np.array(positions)
-        current_pos = positions_array[-1]  # Latest position
-        
-        # Calculate variances
-        variances = np.var(positions_array, axis=0)
-        
-        # Calculate covariances
-        covariances = np.cov(positions_array.T)
+        # Variances are population (ddof=0) and covariances sample (ddof=1), as np.var/np.cov gave
+        variances = np.diag(M2) / n
+        covariances = M2 / (n - 1)
         
         # Create stats dict
         stats = {
@@ -313,17 +334,15 @@ class DataCollectionServer(ServerBringUp):
         }
         
         # Save to CSV
-        timestamp = datetime.utcnow().timestamp()
-        with open(self.variance_file, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                timestamp,
-                ground_truth[0], ground_truth[1], ground_truth[2],
-                current_pos[0], current_pos[1], current_pos[2],
-                orientation,
-                stats['variance_x'], stats['variance_y'], stats['variance_z'],
-                stats['covariance_xy'], stats['covariance_xz'], stats['covariance_yz']
-            ])
+        timestamp = time.time()
+        self._write_row(self._var_fh, self._VAR_FMT.format(
+            ts=timestamp,
+            gx=ground_truth[0], gy=ground_truth[1], gz=ground_truth[2],
+            px=current_pos[0], py=current_pos[1], pz=current_pos[2],
+            ori=orientation,
+            vx=stats['variance_x'], vy=stats['variance_y'], vz=stats['variance_z'],
+            cxy=stats['covariance_xy'], cxz=stats['covariance_xz'], cyz=stats['covariance_yz']
+        ))
             
         return current_pos, stats
 
@@ -382,7 +401,6 @@ class DataCollectionServer(ServerBringUp):
     
     def _background_mode(self):
         """Background mode - just keep running and log status."""
-        import time
         while not self._stop_event.is_set():
             try:
                 time.sleep(5)  # Check every 5 seconds
@@ -543,6 +561,31 @@ class DataCollectionServer(ServerBringUp):
         # Start command processing
         self._command_thread.start()
 
+    def _write_row(self, fh, row: str):
+        """
+        Append one formatted row and flush it, so a hand-collected row is on disk
+        even if the process is killed (atexit does not run on SIGTERM).
+        
+        Raises:
+            RuntimeError: If the server has stopped and the data files are closed
+        """
+        with self._csv_lock:
+            if fh.closed:
+                raise RuntimeError("Server has stopped, data files are closed; row not saved")
+            fh.write(row.encode())
+            fh.flush()
+
+    def _close_csv_files(self):
+        """Flush and close the CSV handles (safe to call more than once)."""
+        with self._csv_lock:
+            self._dp_fh.close()
+            self._var_fh.close()
+
+    def stop(self):
+        """Stop the server and close the data files."""
+        super().stop()
+        self._close_csv_files()
+
 if __name__ == "__main__":
     # Example usage
     mqtt_config = MQTTConfig(
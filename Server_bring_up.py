@@ -67,6 +67,7 @@ class ServerBringUp:
         # Latest state
         self.data: Dict[int, BinnedData] = {}  # phone_node_id -> latest binned data
         self.user_position: Optional[np.ndarray] = None  # User position
+        self._position_cond = threading.Condition()  # Notified on every user_position update
         
         # Processing settings
         self.window_size_seconds = window_size_seconds
@@ -250,8 +251,10 @@ class ServerBringUp:
                             )
                             
                             if pgo_result.success:
-                                # Update user position from anchored results
-                                self.user_position = pgo_result.node_positions[f'phone_{phone_id}']
+                                # Update user position from anchored results and wake any waiters
+                                with self._position_cond:
+                                    self.user_position = pgo_result.node_positions[f'phone_{phone_id}']
+                                    self._position_cond.notify_all()
                                 
                                 logger.info(json.dumps({
                                     "event": "position_updated",
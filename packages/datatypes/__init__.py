@@ -3,5 +3,6 @@ Core datatypes for UWB localization.
 """
 
 from .datatypes import Measurement, BinnedData, AnchorConfig
+from .json_codec import json_loads, json_dumps
 
-__all__ = ['Measurement', 'BinnedData', 'AnchorConfig']
+__all__ = ['Measurement', 'BinnedData', 'AnchorConfig', 'json_loads', 'json_dumps']
@@ -0,0 +1,36 @@
+"""
+JSON encoding/decoding for binned measurement data.
+
+Uses orjson when it is installed (the optional `fast-json` extra) and the
+standard library otherwise; both produce and accept the same JSON.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data) -> Any:
+    """
+    Parse a JSON document (str or bytes).
+
+    Raises:
+        ValueError: If the document is not valid JSON (both backends' decode
+            errors subclass ValueError)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj: Any) -> str:
+    """
+    Serialize obj to a JSON string.
+    numpy arrays are written as nested lists and non-string dict keys
+    (e.g. anchor ids) as strings, like json.dumps does for ints.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=lambda o: o.tolist())
@@ -2,13 +2,14 @@
 Core localization algorithms package.
 """
 
-from .edge_creation.transforms import create_relative_measurement
+from .edge_creation.transforms import create_relative_measurement, batch_transform
 from .edge_creation.anchor_edges import create_anchor_anchor_edges
 from .binning.sliding_window import SlidingWindowBinner, BinningMetrics
 from .pgo.solver import PGOSolver, PGOResult
 
 __all__ = [
     'create_relative_measurement',
+    'batch_transform',
     'create_anchor_anchor_edges',
     'SlidingWindowBinner',
     'BinningMetrics',
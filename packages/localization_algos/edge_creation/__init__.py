@@ -2,7 +2,7 @@
 Edge creation for PGO.
 """
 
-from .transforms import create_relative_measurement
+from .transforms import create_relative_measurement, batch_transform
 from .anchor_edges import create_anchor_anchor_edges
 
-__all__ = ['create_relative_measurement', 'create_anchor_anchor_edges']
+__all__ = ['create_relative_measurement', 'batch_transform', 'create_anchor_anchor_edges']
@@ -74,4 +74,37 @@ def create_relative_measurement(
     # Transform local vector to global frame
     v_global = ANCHOR_R[anchor_id] @ local_vector
     
-    return from_node, to_node, v_global
\ No newline at end of file
+    return from_node, to_node, v_global
+
+# Rotations stacked into one (4, 3, 3) array indexed by anchor_id, for batched transforms
+ANCHOR_R_STACK: np.ndarray = np.stack([ANCHOR_R[anchor_id] for anchor_id in sorted(ANCHOR_R)])
+
+def batch_transform(local_vectors: np.ndarray, anchor_ids: np.ndarray) -> np.ndarray:
+    """
+    Transform many local measurements, from any mix of anchors, to the global frame.
+    Equivalent to create_relative_measurement's rotation applied row by row.
+    
+    Args:
+        local_vectors: (N, 3) vectors in their anchors' local coordinates (cm)
+        anchor_ids: (N,) anchor identifier (0-3) for each vector
+        
+    Returns:
+        (N, 3) vectors in global coordinates
+        
+    Raises:
+        ValueError: If any anchor_id is invalid or the shapes do not match
+    """
+    local_vectors = np.asarray(local_vectors)
+    anchor_ids = np.asarray(anchor_ids)
+
+    if local_vectors.ndim != 2 or local_vectors.shape[1] != 3:
+        raise ValueError(f"local_vectors must be shape (N, 3), got {local_vectors.shape}")
+
+    if anchor_ids.shape != (len(local_vectors),):
+        raise ValueError(f"anchor_ids must be shape ({len(local_vectors)},), got {anchor_ids.shape}")
+
+    if anchor_ids.size and (anchor_ids.min() < 0 or anchor_ids.max() >= len(ANCHOR_R_STACK)):
+        raise ValueError(f"Invalid anchor_id in {np.unique(anchor_ids)}. Must be 0-3.")
+
+    # Gather each vector's rotation and apply them all in one einsum
+    return np.einsum('nij,nj->ni', ANCHOR_R_STACK[anchor_ids], local_vectors)
@@ -0,0 +1,41 @@
+"""
+Tests for the binned-data JSON helpers, with and without orjson.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from packages.datatypes import json_codec
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+def test_json_dumps_matches_stdlib_with_lists(backend):
+    measurements = {0: [np.array([1.0, 2.0, 3.1]), np.array([4.0, 5.0, 6.0])], 3: [np.array([0.1, 0.2, 0.3])]}
+    data = {'bin_start_time': 1.5, 'bin_end_time': 2.5, 'phone_node_id': 0, 'measurements': measurements}
+    expected = {**data, 'measurements': {a: [v.tolist() for v in vs] for a, vs in measurements.items()}}
+
+    encoded = json_codec.json_dumps(data)
+
+    assert isinstance(encoded, str)
+    assert json.loads(encoded) == json.loads(json.dumps(expected))
+
+
+def test_json_loads_round_trip(backend):
+    text = '{"measurements": {"2": [[1.5, -2.0, 3.25]]}}'
+    assert json_codec.json_loads(text) == json.loads(text)
+    assert json_codec.json_loads(text.encode()) == json.loads(text)
+
+
+def test_json_loads_invalid_raises_value_error(backend):
+    with pytest.raises(ValueError):
+        json_codec.json_loads('{"measurements": ')
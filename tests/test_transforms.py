@@ -0,0 +1,59 @@
+"""
+Tests for the batched local -> global anchor transform.
+"""
+
+import numpy as np
+import pytest
+
+from packages.localization_algos.edge_creation.transforms import (
+    ANCHOR_R,
+    ANCHOR_R_STACK,
+    batch_transform,
+    create_relative_measurement,
+)
+
+
+def test_anchor_r_stack_matches_anchor_r():
+    assert ANCHOR_R_STACK.shape == (len(ANCHOR_R), 3, 3)
+    for anchor_id, R in ANCHOR_R.items():
+        np.testing.assert_array_equal(ANCHOR_R_STACK[anchor_id], R)
+
+
+def test_batch_transform_matches_create_relative_measurement():
+    rng = np.random.default_rng(0)
+    anchor_ids = np.repeat(np.array(sorted(ANCHOR_R)), 5)
+    rng.shuffle(anchor_ids)
+    local_vectors = rng.uniform(-500.0, 500.0, size=(len(anchor_ids), 3))
+
+    global_vectors = batch_transform(local_vectors, anchor_ids)
+
+    assert global_vectors.shape == local_vectors.shape
+    for anchor_id, local_vector, global_vector in zip(anchor_ids, local_vectors, global_vectors):
+        _, _, expected = create_relative_measurement(int(anchor_id), 0, local_vector)
+        np.testing.assert_allclose(global_vector, expected, rtol=1e-12, atol=1e-9)
+
+
+def test_batch_transform_empty():
+    result = batch_transform(np.empty((0, 3)), np.empty((0,), dtype=int))
+    assert result.shape == (0, 3)
+
+
+@pytest.mark.parametrize("local_vectors", [
+    np.zeros(3),          # not 2-D
+    np.zeros((4, 2)),     # not 3 components
+    np.zeros((2, 3, 1)),  # too many dimensions
+])
+def test_batch_transform_rejects_bad_vector_shape(local_vectors):
+    with pytest.raises(ValueError):
+        batch_transform(local_vectors, np.zeros(len(local_vectors), dtype=int))
+
+
+def test_batch_transform_rejects_mismatched_ids():
+    with pytest.raises(ValueError):
+        batch_transform(np.zeros((3, 3)), np.zeros(2, dtype=int))
+
+
+@pytest.mark.parametrize("bad_id", [-1, 4])
+def test_batch_transform_rejects_invalid_anchor_id(bad_id):
+    with pytest.raises(ValueError):
+        batch_transform(np.zeros((2, 3)), np.array([0, bad_id]))